@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Content JSON Manager benchmarks
+Times the load, save, validate and autocomplete paths of content_store.py
+against synthetic content.json files. Runs without a display.
+
+Usage:
+    python benchmarkContent.py [--sizes 100,1000,10000,100000] [--output bench-results.json]
+    python benchmarkContent.py --compare previous-results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import content_store as cs
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+WORDS = ("built", "designed", "team", "data", "service", "users", "cloud", "migrated",
+         "frontend", "backend", "pipeline", "tests", "performance", "deployed", "feature",
+         "stakeholders", "system", "modernised", "course", "project", "learned", "led")
+SYLLABLES = ("py", "ja", "va", "script", "type", "go", "rust", "net", "sql", "react",
+             "node", "dock", "er", "kube", "flask", "spring", "tensor", "flow", "git", "c")
+
+
+def make_vocabulary(rng: random.Random, size: int) -> List[str]:
+    """Distinct, realistic-looking skill names"""
+    vocabulary = set()
+    while len(vocabulary) < size:
+        name = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3)))
+        name = name.capitalize() if rng.random() < 0.7 else name.upper()
+        if name in vocabulary:
+            # Syllable combinations run out well before 20k; version the rest
+            name = f"{name} {rng.randint(2, 99)}"
+        vocabulary.add(name)
+    return sorted(vocabulary)
+
+
+def make_content(n: int, seed: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+    """Synthetic content.json with n entries.
+
+    Skills follow a Zipf-like distribution (a few very common skills and a
+    long tail), which is what real portfolios look like.
+    """
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng, min(20000, n // 2 + 50))
+    cum_weights = []
+    total = 0.0
+    for rank in range(1, len(vocabulary) + 1):
+        total += 1 / rank ** 1.1
+        cum_weights.append(total)
+
+    content = cs.empty_content()
+    types = list(cs.CATEGORY_KEYS)
+    for i in range(n):
+        entry_type = rng.choice(types)
+        year = rng.randint(2000, 2025)
+        entry = {
+            "id": f"entry-{i}",
+            "title": f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)} {i}",
+            "company": f"Company {rng.randint(1, n // 10 + 1)}",
+            "startDate": f"{year}-{rng.randint(1, 12):02d}",
+            "detail": ' '.join(rng.choice(WORDS) for _ in range(rng.randint(50, 300))),
+            "skills": sorted(set(rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(3, 8)))),
+            "type": entry_type,
+            "category": cs.DEFAULT_CATEGORIES[entry_type],
+            "relevance": rng.randint(1, 5)
+        }
+        if rng.random() < 0.5:
+            entry["endDate"] = f"{year + 1}-{rng.randint(1, 12):02d}"
+        content[cs.CATEGORY_KEYS[entry_type]].append(entry)
+    return content
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Time func repeat times, then run it once more under tracemalloc"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": {"min": min(timings), "median": statistics.median(timings)},
+        "peak_bytes": peak
+    }
+
+
+def linear_autocomplete(values: List[str], queries: List[str]):
+    """The original per-keystroke scan, kept as a reference point"""
+    for query in queries:
+        [item for item in values if query.lower() in item.lower()]
+
+
+def bench_size(n: int, repeat: int, workdir: str) -> List[Dict[str, Any]]:
+    """Run every benchmark against one synthetic file of n entries"""
+    content = make_content(n)
+    path = os.path.join(workdir, f"content-{n}.json")
+    with open(path, 'wb') as f:
+        f.write(cs.serialize_content(content))
+
+    store = cs.ContentStore(path)
+    store.load()
+    store.wait_for_snapshot()  # load_existing_data_snapshot reads it
+    entries = list(cs.iter_entries(store.content_data))
+    skills = sorted(store.all_skills)
+    # Keystroke sequences: type out a few common and rare skills
+    queries = [skill[:i] for skill in (skills[:3] + skills[-3:]) for i in range(1, len(skill) + 1)]
+    new_entry = dict(entries[0], id="benchmark-new-entry")
+
+    def load():
+        # The JSON parse, comparable with results from before the snapshot existed
+        cs.ContentStore(path, snapshot=False).load()
+
+    def load_snapshot():
+        cs.ContentStore(path).load()
+
+    def save():
+        store.save()
+
+    def journaled_add():
+        journal_store = cs.ContentStore(path, journal=True, compact_every=10 ** 9)
+        journal_store.content_data = store.content_data
+        journal_store._append_journal({'op': 'add', 'entry': new_entry})
+
+    def validate():
+        for entry in entries:
+            cs.validate_entry(entry)
+
+    def autocomplete():
+        index = cs.SkillIndex(skills)
+        for query in queries:
+            index.search(query)
+
+    operations = {
+        "load_existing_data": load,
+        "load_existing_data_snapshot": load_snapshot,
+        "add_entry_save": save,
+        "add_entry_journal_append": journaled_add,
+        "validate_form": validate,
+        "autocomplete": autocomplete,
+        "autocomplete_linear_reference": lambda: linear_autocomplete(skills, queries),
+    }
+
+    results = []
+    try:
+        for name, func in operations.items():
+            result = {"size": n, "operation": name, "file_bytes": os.path.getsize(path)}
+            result.update(measure(func, repeat))
+            results.append(result)
+            print(f"{n:>7} {name:<32} {result['seconds']['median'] * 1000:>10.2f} ms"
+                  f" {result['peak_bytes'] / 1024:>10.0f} KiB", file=sys.stderr)
+    finally:
+        os.unlink(path)
+        if os.path.exists(store.journal_path):
+            os.unlink(store.journal_path)
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> List[str]:
+    """Operations whose median time grew by more than threshold vs the baseline"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r['size'], r['operation']): r for r in json.load(f)['results']}
+
+    regressions = []
+    for result in results:
+        before = baseline.get((result['size'], result['operation']))
+        if before is None:
+            continue
+        old, new = before['seconds']['median'], result['seconds']['median']
+        if old > 0 and new > old * (1 + threshold):
+            regressions.append(f"{result['operation']} @ {result['size']}: "
+                               f"{old * 1000:.2f} ms -> {new * 1000:.2f} ms")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the content manager's hot paths")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated entry counts (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per operation")
+    parser.add_argument('--output', default='bench-results.json', help="where to write the JSON results")
+    parser.add_argument('--compare', help="previous results file to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="allowed slowdown vs --compare before failing (default: 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in sizes:
+            results.extend(bench_size(n, args.repeat, workdir))
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
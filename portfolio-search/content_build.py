@@ -0,0 +1,249 @@
+"""
+Incremental builds of the files derived from content.json
+Tracks what every artifact was built from and rebuilds only what changed.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Any, Tuple
+
+from content_store import (
+    ContentStore, SkillRegistry, atomic_write, entry_hash, index_ids, iter_entries,
+    load_skill_aliases
+)
+from content_sqlite import SQLiteStore
+from content_index import (
+    SEARCH_FIELDS, SHARDS_DIR, build_search_index, export_shards, id_index_path, search_index_path,
+    skills_index_path, suggestions_path, write_id_index, write_skills_index, write_suggestions
+)
+from content_media import Image, MEDIA_CACHE_FILE, build_store_media
+from content_dedup import DuplicateIndex, duplicate_cache_path
+
+# Bumped when an artifact's output changes for the same input (a new
+# search-index tokenizer, say), so the next build redoes everything
+BUILD_STATE_VERSION = 2
+
+
+def build_state_path(file_path: str) -> str:
+    """Entry hashes and artifact input digests from the last build"""
+    directory, name = os.path.split(file_path)
+    return os.path.join(directory, f".{name}.build.json")
+
+
+def _shards_path(file_path: str) -> str:
+    return os.path.join(os.path.dirname(file_path), SHARDS_DIR)
+
+
+# Derived artifacts the build command knows: name -> (output path for a
+# content.json path, entry fields the output reads or None for all of
+# them, whether skill-aliases.json is an input). Every artifact also
+# depends on which entries exist and their order.
+BUILD_ARTIFACTS = {
+    'search-index': (search_index_path, ('id',) + SEARCH_FIELDS, False),
+    'id-index': (id_index_path, ('id',), False),
+    'skills-index': (skills_index_path, ('id', 'title', 'relevance', 'skills'), True),
+    'suggestions': (suggestions_path, ('id', 'title', 'company', 'category', 'relevance', 'skills'), True),
+    'shards': (_shards_path, None, False),
+    'duplicates': (duplicate_cache_path, ('id', 'title', 'detail'), False),
+}
+
+
+def artifact_digest(content_data: Dict[str, Any], fields: Optional[Tuple[str, ...]],
+                    extra: bytes = b'') -> str:
+    """Fingerprint of everything an artifact reads from content_data"""
+    digest = hashlib.sha1(extra)
+    for key, category in content_data.items():
+        digest.update(f"\0{key}\0".encode('utf-8'))
+        for entry in category:
+            projection = entry if fields is None else [entry.get(field) for field in fields]
+            digest.update(json.dumps(projection, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+            digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def media_sources(entry: Dict[str, Any]) -> List[str]:
+    """Media files of one entry, relative to the media root (as build_media finds them)"""
+    sources = [f"{entry['id']}/{photo.get('filename')}" for photo in entry.get('photos') or []]
+    if entry.get('video'):
+        sources.append(f"videos/{entry['video']}")
+    return sources
+
+
+def media_fingerprint(entry: Dict[str, Any], media_root: str) -> str:
+    """What the media outputs of one entry depend on: its sources and their stats"""
+    stats = []
+    for rel in media_sources(entry):
+        try:
+            stat = os.stat(os.path.join(media_root, rel))
+            stats.append([rel, stat.st_mtime_ns, stat.st_size])
+        except OSError:
+            stats.append([rel, None, None])
+    return hashlib.sha1(json.dumps(stats).encode('utf-8')).hexdigest()[:12]
+
+
+def run_artifact(name: str, file_path: str, content_data: Dict[str, Any],
+                 changed: Optional[set] = None) -> str:
+    """Rebuild one artifact (possibly in a worker process); returns a report line.
+
+    changed is the ids touched since the artifact was last built, or None
+    if that is unknown.
+    """
+    if name == 'search-index':
+        index, indexed = build_search_index(content_data, search_index_path(file_path))
+        return f"{indexed} entries reindexed"
+    if name == 'id-index':
+        id_index = index_ids(content_data)
+        write_id_index(id_index, id_index_path(file_path))
+        return f"{len(id_index)} ids"
+
+    entries = {entry.get('id'): entry for entry in iter_entries(content_data)}
+    if name in ('skills-index', 'suggestions'):
+        registry = SkillRegistry.build(content_data, load_skill_aliases(file_path))
+        skills_json = registry.to_json(entries.get)
+        if name == 'skills-index':
+            write_skills_index(skills_json, skills_index_path(file_path))
+            return f"{len(registry.entries)} skills"
+        table = write_suggestions(file_path, content_data, skills_json)
+        return f"{len(table['content'])} content and {len(table['skills'])} skill queries"
+    if name == 'shards':
+        written, unchanged, removed = export_shards(content_data, _shards_path(file_path), changed)
+        return f"{written} chunks written, {unchanged} unchanged, {removed} removed"
+    if name == 'duplicates':
+        cache_path = duplicate_cache_path(file_path)
+        index = DuplicateIndex.build(content_data, cache_path)
+        atomic_write(cache_path, index.dumps())
+        return f"{len(index.signatures)} signatures"
+    raise ValueError(f"Unknown artifact {name!r}")
+
+
+def build_outputs(store: ContentStore, targets: Optional[List[str]] = None,
+                  media_root: Optional[str] = None, jobs: Optional[int] = None,
+                  out=sys.stdout) -> Tuple[int, int]:
+    """Bring every derived artifact up to date, rebuilding only what changed.
+
+    The last build's entry hashes and each artifact's input digest are
+    kept in .<file>.build.json. An artifact is rebuilt when the entry
+    fields it reads (BUILD_ARTIFACTS), the set or order of entries, or
+    its other inputs changed, or its output is missing; the ids changed
+    since its last build are handed to it so per-entry outputs (shards)
+    skip the rest.
+
+    Without targets, the artifacts whose outputs already exist are kept
+    up to date, plus media when <media_root>/.media-cache.json exists.
+    Media runs first because it writes metadata back into the entries
+    (and content.json); the other artifacts are independent of each other
+    and run across a process pool. A journal with pending records or a
+    --db store also gets its content.json export rewritten. Returns
+    (rebuilt, failed).
+    """
+    file_path = store.file_path
+    state_path = build_state_path(file_path)
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        state = {}
+    if state.get('version') != BUILD_STATE_VERSION:
+        state = {}
+    digests = dict(state.get('artifacts', {}))
+    rebuilt = failed = 0
+
+    names = targets or [name for name, (path, _, _) in BUILD_ARTIFACTS.items() if os.path.exists(path(file_path))]
+    media_root = media_root or os.path.join('public', 'content')
+    if targets is None and os.path.exists(os.path.join(media_root, MEDIA_CACHE_FILE)):
+        names = ['media'] + names
+
+    requested = bool(names)
+    save_needed = isinstance(store, SQLiteStore) or store.pending > 0
+    media_state = dict(state.get('media', {}))
+    if 'media' in names:
+        fingerprints = {entry['id']: media_fingerprint(entry, media_root)
+                        for entry in iter_entries(store.content_data)
+                        if entry.get('photos') or entry.get('video')}
+        stale = {entry_id for entry_id, fingerprint in fingerprints.items()
+                 if media_state.get(entry_id) != fingerprint}
+        # The same entry dicts, so build_media's metadata lands in the store
+        subset = {key: [entry for entry in category if entry.get('id') in stale]
+                  for key, category in store.content_data.items()}
+        if stale and Image is None:
+            print("media: skipped, Pillow is not installed", file=out)
+            failed += 1
+        elif stale:
+            processed, skipped, media_failed, media_changed = build_store_media(store, subset, media_root,
+                                                                                jobs, out=out)
+            print(f"media: {processed} processed, {skipped} unchanged, {media_failed} failed", file=out)
+            save_needed = save_needed or media_changed > 0
+            rebuilt += 1
+            failed += 1 if media_failed else 0
+            # Entries with missing files are not retried until the files show up
+            # (their fingerprint changes then); other failures are retried
+            for entry_id in stale:
+                if not media_failed or not all(os.path.exists(os.path.join(media_root, rel))
+                                               for rel in media_sources(store.get(entry_id))):
+                    media_state[entry_id] = fingerprints[entry_id]
+        media_state = {entry_id: media_state[entry_id] for entry_id in fingerprints if entry_id in media_state}
+        names = [name for name in names if name != 'media']
+
+    if save_needed:
+        store.save()
+        print(f"content: exported {file_path}", file=out)
+
+    hashes = {entry.get('id'): entry_hash(entry) for entry in iter_entries(store.content_data)}
+    previous = state.get('entries', {})
+    changed = {entry_id for entry_id in hashes.keys() | previous.keys()
+               if hashes.get(entry_id) != previous.get(entry_id)}
+    # Ids changed since each artifact was last built (it may have been skipped since)
+    pending = {name: set(ids) for name, ids in state.get('pending', {}).items()}
+    for name in digests:
+        pending.setdefault(name, set()).update(changed)
+
+    aliases = load_skill_aliases(file_path)
+    dirty = {}
+    for name in names:
+        if name not in BUILD_ARTIFACTS:
+            raise ValueError(f"Unknown artifact {name!r}")
+        path, fields, uses_aliases = BUILD_ARTIFACTS[name]
+        extra = json.dumps(aliases, sort_keys=True).encode('utf-8') if uses_aliases else b''
+        digest = artifact_digest(store.content_data, fields, extra)
+        if digest != digests.get(name) or not os.path.exists(path(file_path)):
+            dirty[name] = digest
+        else:
+            pending.pop(name, None)  # already reflects every change
+
+    def finish(name: str, report: str):
+        nonlocal rebuilt
+        digests[name] = dirty[name]
+        pending[name] = set()
+        rebuilt += 1
+        print(f"{name}: {report}", file=out)
+
+    if len(dirty) > 1 and jobs != 1:
+        with ProcessPoolExecutor(max_workers=min(len(dirty), jobs or os.cpu_count() or 1)) as pool:
+            futures = {pool.submit(run_artifact, name, file_path, store.content_data,
+                                   pending.get(name)): name
+                       for name in dirty}
+            for future in as_completed(futures):
+                try:
+                    finish(futures[future], future.result())
+                except Exception as e:
+                    print(f"{futures[future]}: failed: {e}", file=out)
+                    failed += 1
+    else:
+        for name in dirty:
+            try:
+                finish(name, run_artifact(name, file_path, store.content_data, pending.get(name)))
+            except Exception as e:
+                print(f"{name}: failed: {e}", file=out)
+                failed += 1
+
+    state = {"version": BUILD_STATE_VERSION, "entries": hashes, "artifacts": digests, "media": media_state,
+             "pending": {name: sorted(ids) for name, ids in pending.items() if ids}}
+    atomic_write(state_path, json.dumps(state, separators=(',', ':')).encode('utf-8'))
+    if not requested and not rebuilt and not failed:
+        print("Nothing to build: no derived files exist yet (name them or use --all)", file=out)
+    elif not rebuilt and not failed:
+        print(f"Up to date ({len(changed)} entries changed)", file=out)
+    return rebuilt, failed
@@ -0,0 +1,185 @@
+"""
+Near-duplicate detection for content.json
+MinHash signatures of entry text, bucketed with LSH.
+"""
+
+import hashlib
+import marshal
+import os
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+
+from content_store import iter_entries
+from content_index import TOKEN_PATTERN
+
+# MinHash near-duplicate detection: signature length and LSH banding.
+# 32 bands of 4 rows make pairs above ~0.45 Jaccard similarity likely
+# candidates; candidates are then checked against the threshold.
+MINHASH_PERMUTATIONS = 128
+MINHASH_BANDS = 32
+MINHASH_SHINGLE = 3  # words per shingle
+DEDUP_THRESHOLD = 0.5
+
+
+def shingles(entry: Dict[str, Any]) -> set:
+    """Word n-grams of an entry's title and detail text"""
+    text = f"{entry.get('title', '')} {entry.get('detail', '')}".replace('\\n', ' ')
+    words = TOKEN_PATTERN.findall(text.lower())
+    if len(words) < MINHASH_SHINGLE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + MINHASH_SHINGLE]) for i in range(len(words) - MINHASH_SHINGLE + 1)}
+
+
+def duplicate_cache_path(file_path: str) -> str:
+    """Cached signatures live in a hidden file next to content.json"""
+    directory, name = os.path.split(file_path)
+    return os.path.join(directory, f".{name}.minhash")
+
+
+class DuplicateIndex:
+    """MinHash signatures of every entry, bucketed for LSH lookups.
+
+    Each entry's title and detail are shingled into word n-grams and
+    reduced to a MINHASH_PERMUTATIONS-long signature; the fraction of
+    matching positions between two signatures estimates the Jaccard
+    similarity of their shingle sets. Signatures are split into
+    MINHASH_BANDS bands and entries sharing any band land in the same
+    bucket, so finding an entry's likely duplicates only compares it with
+    its bucket-mates instead of every other entry.
+
+    Signatures are cached per id together with a hash of the text they
+    came from, so after the first run only new or edited entries are
+    hashed again.
+    """
+
+    VERSION = 1
+
+    def __init__(self):
+        self.rows = MINHASH_PERMUTATIONS // MINHASH_BANDS
+        self.signatures: Dict[str, Tuple[str, Tuple[int, ...]]] = {}  # id -> (text hash, signature)
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], set] = {}
+
+    @classmethod
+    def build(cls, content_data: Dict[str, Any], cache_path: Optional[str] = None) -> 'DuplicateIndex':
+        """Index content_data, reusing cached signatures where the text is unchanged"""
+        index = cls()
+        cached = index.read_cache(cache_path) if cache_path else {}
+        for entry in iter_entries(content_data):
+            digest, signature = cached.get(entry.get('id', ''), (None, None))
+            if digest == index.text_hash(entry):
+                index._insert(entry['id'], digest, signature)
+            else:
+                index.add(entry)
+        return index
+
+    @staticmethod
+    def text_hash(entry: Dict[str, Any]) -> str:
+        text = f"{entry.get('title', '')}\0{entry.get('detail', '')}"
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+    @staticmethod
+    def signature(entry: Dict[str, Any]) -> Tuple[int, ...]:
+        # One-permutation hashing: each shingle is hashed once and the hash
+        # picks a position, which keeps the smallest value it sees. Empty
+        # positions borrow from the next filled one to the right, offset by
+        # the distance, so short texts still compare position by position.
+        size = MINHASH_PERMUTATIONS
+        slots: List[Optional[int]] = [None] * size
+        for shingle in shingles(entry):
+            h = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+            position, value = h % size, h // size
+            if slots[position] is None or value < slots[position]:
+                slots[position] = value
+        if all(value is None for value in slots):
+            return (0,) * size
+        signature = []
+        for position in range(size):
+            distance = 0
+            while slots[(position + distance) % size] is None:
+                distance += 1
+            signature.append(slots[(position + distance) % size] + (distance << 58))
+        return tuple(signature)
+
+    def _bands(self, signature: Tuple[int, ...]) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+        for band in range(MINHASH_BANDS):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def _insert(self, entry_id: str, digest: str, signature: Tuple[int, ...]):
+        self.signatures[entry_id] = (digest, signature)
+        for key in self._bands(signature):
+            self.buckets.setdefault(key, set()).add(entry_id)
+
+    def add(self, entry: Dict[str, Any]):
+        self.remove(entry['id'])
+        self._insert(entry['id'], self.text_hash(entry), self.signature(entry))
+
+    def remove(self, entry_id: str):
+        _, signature = self.signatures.pop(entry_id, (None, None))
+        if signature is None:
+            return
+        for key in self._bands(signature):
+            bucket = self.buckets[key]
+            bucket.discard(entry_id)
+            if not bucket:
+                del self.buckets[key]
+
+    @staticmethod
+    def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+
+    def similar(self, entry: Dict[str, Any], threshold: float = DEDUP_THRESHOLD) -> List[Tuple[float, str]]:
+        """Indexed entries that look like entry, most similar first"""
+        cached = self.signatures.get(entry.get('id', ''))
+        if cached is not None and cached[0] == self.text_hash(entry):
+            signature = cached[1]
+        else:
+            signature = self.signature(entry)
+
+        candidates = set()
+        for key in self._bands(signature):
+            candidates.update(self.buckets.get(key, ()))
+        candidates.discard(entry.get('id', ''))
+
+        matches = []
+        for candidate in candidates:
+            score = self.similarity(signature, self.signatures[candidate][1])
+            if score >= threshold:
+                matches.append((score, candidate))
+        return sorted(matches, key=lambda match: (-match[0], match[1]))
+
+    def pairs(self, threshold: float = DEDUP_THRESHOLD) -> List[Tuple[float, str, str]]:
+        """Every pair of indexed entries at or above threshold, most similar first"""
+        seen = set()
+        found = []
+        for bucket in self.buckets.values():
+            if len(bucket) < 2:
+                continue
+            members = sorted(bucket)
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    if (a, b) in seen:
+                        continue
+                    seen.add((a, b))
+                    score = self.similarity(self.signatures[a][1], self.signatures[b][1])
+                    if score >= threshold:
+                        found.append((score, a, b))
+        return sorted(found, key=lambda pair: (-pair[0], pair[1], pair[2]))
+
+    def dumps(self) -> bytes:
+        return marshal.dumps({
+            'version': self.VERSION,
+            'params': [MINHASH_PERMUTATIONS, MINHASH_BANDS, MINHASH_SHINGLE],
+            'signatures': self.signatures
+        })
+
+    @classmethod
+    def read_cache(cls, path: str) -> Dict[str, Tuple[str, Tuple[int, ...]]]:
+        """Cached signatures, or {} if missing, unreadable or built with other parameters"""
+        try:
+            with open(path, 'rb') as f:
+                data = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return {}
+        if (not isinstance(data, dict) or data.get('version') != cls.VERSION
+                or data.get('params') != [MINHASH_PERMUTATIONS, MINHASH_BANDS, MINHASH_SHINGLE]):
+            return {}
+        return data['signatures']
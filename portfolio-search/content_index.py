@@ -0,0 +1,373 @@
+"""
+Derived files the site reads next to content.json
+The inverted search index, the id and skills lookup tables, precomputed
+search-box suggestions and the sharded export.
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Optional, Any, Tuple
+
+from content_store import CATEGORY_KEYS, atomic_write, entry_hash, iter_entries
+
+# Field order and weights must match searchContent in src/utils/contentUtils.ts
+SEARCH_FIELDS = ('title', 'company', 'category', 'detail', 'skills')
+SEARCH_WEIGHTS = (10, 5, 3, 2, 8)
+SEARCH_INDEX_FILE = 'search-index.json'
+ID_INDEX_FILE = 'id-index.json'
+SKILLS_INDEX_FILE = 'skills-index.json'
+SUGGESTIONS_FILE = 'suggestions.json'
+SUGGEST_PREFIX_LENGTH = 3  # longest typed query with a precomputed answer
+SUGGEST_LIMIT = 8  # suggestions kept per query, per kind
+SUGGEST_SKILL_MIN = 2  # the search boxes only suggest skills from 2 characters on
+TOKEN_PATTERN = re.compile(r"[\w+#]+(?:[.'-][\w+#]+)*")
+
+
+def tokenize(text: str) -> set:
+    """Split text into lowercased search terms ("C++" and "Node.js" stay whole).
+
+    The form stores line breaks in detail as a literal backslash-n, which
+    would otherwise glue an "n" onto the next word.
+    """
+    return set(TOKEN_PATTERN.findall(text.replace('\\n', ' ').lower()))
+
+
+def search_index_path(file_path: str) -> str:
+    """The search index lives next to content.json"""
+    return os.path.join(os.path.dirname(file_path), SEARCH_INDEX_FILE)
+
+
+class SearchIndex:
+    """Inverted index of the fields searchContent scores.
+
+    Each term maps to postings of [doc, mask], where doc indexes the docs
+    id list and bit i of mask is set when the term occurs in
+    SEARCH_FIELDS[i]. A client scores a doc by summing SEARCH_WEIGHTS for
+    the set bits (bit 4 is the foundInSkills tie-break), and can expand a
+    partial query term by bisecting the sorted term list instead of
+    scanning every item's text.
+
+    Lookups by term or term prefix do not reproduce every match of
+    searchContent, which tests includes() on the raw text: "script" finds
+    "JavaScript" there but is neither a term nor a prefix of one here.
+
+    Removed entries leave a null slot in docs so other doc numbers stay
+    valid; the slots are reclaimed when sync() decides to rebuild.
+    """
+
+    VERSION = 2
+
+    def __init__(self):
+        self.docs: List[Optional[str]] = []
+        self.hashes: List[Optional[str]] = []
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self._doc_terms: Optional[Dict[int, List[str]]] = None
+
+    @classmethod
+    def from_content(cls, content_data: Dict[str, Any]) -> 'SearchIndex':
+        index = cls()
+        for entry in iter_entries(content_data):
+            index.add(entry)
+        return index
+
+    def add(self, entry: Dict[str, Any]) -> set:
+        """Index one entry, returning the terms whose postings changed"""
+        doc = len(self.docs)
+        self.docs.append(entry.get('id', ''))
+        self.hashes.append(entry_hash(entry))
+
+        masks: Dict[str, int] = {}
+        for bit, field in enumerate(SEARCH_FIELDS):
+            value = entry.get(field) or ''
+            text = ' '.join(value) if field == 'skills' else str(value)
+            for term in tokenize(text):
+                masks[term] = masks.get(term, 0) | (1 << bit)
+
+        for term, mask in masks.items():
+            self.postings.setdefault(term, {})[doc] = mask
+        if self._doc_terms is not None:
+            self._doc_terms[doc] = list(masks)
+        return set(masks)
+
+    def remove(self, doc: int) -> set:
+        """Drop one doc's postings, returning the terms whose postings changed"""
+        if self._doc_terms is None:
+            self._doc_terms = {}
+            for term, postings in self.postings.items():
+                for d in postings:
+                    self._doc_terms.setdefault(d, []).append(term)
+
+        terms = self._doc_terms.pop(doc, [])
+        for term in terms:
+            postings = self.postings[term]
+            del postings[doc]
+            if not postings:
+                del self.postings[term]
+        self.docs[doc] = self.hashes[doc] = None
+        return set(terms)
+
+    def sync(self, content_data: Dict[str, Any]) -> int:
+        """Bring the index up to date with content_data.
+
+        Only entries that were added, edited or removed since the index was
+        built have their postings touched. Returns the number of entries
+        (re)indexed or removed.
+        """
+        current = {}
+        for entry in iter_entries(content_data):
+            current[entry.get('id', '')] = entry
+
+        indexed = {doc_id: doc for doc, doc_id in enumerate(self.docs) if doc_id is not None}
+        stale = {doc for doc_id, doc in indexed.items()
+                 if doc_id not in current or self.hashes[doc] != entry_hash(current[doc_id])}
+        fresh = [entry for doc_id, entry in current.items()
+                 if doc_id not in indexed or indexed[doc_id] in stale]
+
+        # Too many holes: renumber from scratch instead
+        holes = len(self.docs) - len(indexed) + len(stale)
+        if holes and holes * 4 > len(self.docs):
+            rebuilt = self.from_content(content_data)
+            self.docs, self.hashes, self.postings = rebuilt.docs, rebuilt.hashes, rebuilt.postings
+            self._doc_terms = None
+            return len(current)
+
+        removed = sum(1 for doc in stale if self.docs[doc] not in current)
+        for doc in sorted(stale):
+            self.remove(doc)
+        for entry in fresh:
+            self.add(entry)
+        return removed + len(fresh)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "version": self.VERSION,
+            "fields": list(SEARCH_FIELDS),
+            "weights": list(SEARCH_WEIGHTS),
+            "docs": self.docs,
+            "hashes": self.hashes,
+            "postings": {term: sorted(self.postings[term].items()) for term in sorted(self.postings)}
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> 'SearchIndex':
+        index = cls()
+        if data.get('version') != cls.VERSION or data.get('weights') != list(SEARCH_WEIGHTS):
+            return index  # stale format; sync() will rebuild
+        index.docs = list(data['docs'])
+        index.hashes = list(data['hashes'])
+        index.postings = {term: {doc: mask for doc, mask in postings}
+                          for term, postings in data['postings'].items()}
+        return index
+
+    @classmethod
+    def load(cls, path: str) -> 'SearchIndex':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_json(json.load(f))
+
+    def save(self, path: str):
+        data = json.dumps(self.to_json(), ensure_ascii=False, separators=(',', ':'))
+        atomic_write(path, data.encode('utf-8'))
+
+
+def id_index_path(file_path: str) -> str:
+    """The id lookup table lives next to content.json"""
+    return os.path.join(os.path.dirname(file_path), ID_INDEX_FILE)
+
+
+def write_id_index(id_index: Dict[str, Tuple[str, int]], path: str):
+    """Export id -> [category key, position] so /content/[id] needs no scan"""
+    data = {entry_id: list(location) for entry_id, location in id_index.items()}
+    atomic_write(path, json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def skills_index_path(file_path: str) -> str:
+    """The skills index lives next to content.json"""
+    return os.path.join(os.path.dirname(file_path), SKILLS_INDEX_FILE)
+
+
+def write_skills_index(skills_json: Dict[str, Any], path: str):
+    """Export the skill registry so /skills/[skill] is a direct lookup"""
+    atomic_write(path, json.dumps(skills_json, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def suggestions_path(file_path: str) -> str:
+    """The suggestion table lives next to content.json"""
+    return os.path.join(os.path.dirname(file_path), SUGGESTIONS_FILE)
+
+
+def _substrings(text: str, max_length: int) -> set:
+    """Every substring of text up to max_length characters (what includes() can match)"""
+    return {text[i:i + length] for i in range(len(text)) for length in range(1, max_length + 1)
+            if i + length <= len(text)}
+
+
+def build_suggestions(content_data: Dict[str, Any], skills_json: Dict[str, Any],
+                      max_prefix: int = SUGGEST_PREFIX_LENGTH, limit: int = SUGGEST_LIMIT) -> Dict[str, Any]:
+    """Precompute the HomePage/SpotlightSearch suggestions for every short query.
+
+    For each lowercased query of up to max_prefix characters that matches
+    anything, "content" lists the ids whose title or company contains it,
+    ranked like the search boxes rank them (relevance, then file order),
+    and "skills" lists the matching skills (exact, then prefix, then
+    alphabetical). "skillResults" holds the top entries of every skill
+    from skills_json (SkillRegistry.to_json). Longer queries are not in
+    the table and need the live scan.
+    """
+    entries = {}
+    content: Dict[str, List[str]] = {}
+    ranked = sorted(iter_entries(content_data), key=lambda entry: -(entry.get('relevance') or 0))
+    for entry in ranked:
+        title, company = str(entry.get('title') or ''), str(entry.get('company') or '')
+        entries[entry['id']] = {"title": title, "subtitle": company or entry.get('category', ''),
+                                "relevance": entry.get('relevance')}
+        for query in _substrings(title.lower(), max_prefix) | _substrings(company.lower(), max_prefix):
+            ids = content.setdefault(query, [])
+            if len(ids) < limit:
+                ids.append(entry['id'])
+
+    skills: Dict[str, List[str]] = {}
+    for info in skills_json['skills'].values():
+        for query in _substrings(info['name'].lower(), max_prefix):
+            if len(query) >= SUGGEST_SKILL_MIN:
+                skills.setdefault(query, []).append(info['name'])
+    for query, names in skills.items():
+        names.sort(key=lambda name: (name.lower() != query, not name.lower().startswith(query), name.casefold()))
+        del names[limit:]
+
+    skill_results = {key: {"name": info['name'], "count": info['count'], "top": info['entries'][:limit]}
+                     for key, info in skills_json['skills'].items()}
+    return {
+        "version": 1,
+        "maxPrefix": max_prefix,
+        "limit": limit,
+        "entries": entries,
+        "content": dict(sorted(content.items())),
+        "skills": dict(sorted(skills.items())),
+        "skillResults": skill_results
+    }
+
+
+def write_suggestions(file_path: str, content_data: Dict[str, Any], skills_json: Dict[str, Any],
+                      max_prefix: Optional[int] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+    """Rebuild suggestions.json, keeping the existing table's sizes unless given"""
+    path = suggestions_path(file_path)
+    if max_prefix is None or limit is None:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            previous = {}
+        max_prefix = max_prefix or previous.get('maxPrefix', SUGGEST_PREFIX_LENGTH)
+        limit = limit or previous.get('limit', SUGGEST_LIMIT)
+    table = build_suggestions(content_data, skills_json, max_prefix, limit)
+    atomic_write(path, json.dumps(table, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    return table
+
+
+def build_search_index(content_data: Dict[str, Any], path: str) -> Tuple[SearchIndex, int]:
+    """Load the index at path (if any), bring it up to date and save it"""
+    try:
+        index = SearchIndex.load(path)
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+        index = SearchIndex()
+    indexed = index.sync(content_data)
+    if indexed or not os.path.exists(path):
+        index.save(path)
+    return index, indexed
+
+
+# Fields every page needs to list/search entries; the rest load on demand
+SUMMARY_FIELDS = ('id', 'title', 'company', 'type', 'category', 'relevance', 'skills')
+SHARDS_DIR = 'shards'
+MANIFEST_FILE = 'manifest.json'
+
+
+def _chunk_bytes(data: Any) -> Tuple[bytes, str]:
+    """Serialize a chunk compactly and return it with its content hash"""
+    raw = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return raw, hashlib.sha1(raw).hexdigest()[:12]
+
+
+def _chunk_name(entry_id: str) -> str:
+    """Filesystem-safe chunk name for an id, distinct for distinct ids.
+
+    Plain slugs are used as they are. Any other id ("a.b", "Foo", which a
+    case-insensitive filesystem would fold into "foo") gets "~" and a
+    short hash of the id appended; "~" never occurs in a plain slug, so
+    "a.b" and "a_b" no longer share a chunk.
+    """
+    if re.fullmatch(r'[a-z0-9_-]+', entry_id):
+        return entry_id
+    safe = re.sub(r'[^a-z0-9_-]', '_', entry_id.lower())
+    return f"{safe}~{hashlib.sha1(entry_id.encode('utf-8')).hexdigest()[:8]}"
+
+
+def export_shards(content_data: Dict[str, Any], out_dir: str,
+                  changed: Optional[set] = None) -> Tuple[int, int, int]:
+    """Write a summary manifest plus per-category and per-entry chunks.
+
+    manifest.json lists SUMMARY_FIELDS for every entry (in getAllContent
+    order) and the path and hash of each chunk. categories/<key>.json maps
+    id -> the remaining, heavy fields; entries/<id>.json is one full entry.
+    A chunk is only rewritten when its hash differs from the previous
+    manifest, and chunks of removed entries are deleted. With changed (the
+    ids added, edited or removed since the last export), chunks that only
+    hold other entries keep their previous hash without being
+    serialized again. Returns (written, unchanged, removed).
+    """
+    manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f).get('chunks', {})
+    except (FileNotFoundError, json.JSONDecodeError):
+        previous = {}
+
+    chunks: Dict[str, Dict[str, Any]] = {}
+    pending: Dict[str, bytes] = {}
+
+    def add_chunk(path: str, data: Any, reuse: bool = False):
+        if reuse and path in previous and os.path.exists(os.path.join(out_dir, path)):
+            chunks[path] = previous[path]
+            return
+        raw, digest = _chunk_bytes(data)
+        chunks[path] = {"hash": digest}
+        if previous.get(path, {}).get('hash') != digest or not os.path.exists(os.path.join(out_dir, path)):
+            pending[path] = raw
+
+    # A removed entry may have been in any category
+    current = {entry.get('id') for entry in iter_entries(content_data)}
+    removed_any = changed is not None and bool(changed - current)
+
+    summaries = []
+    for key in CATEGORY_KEYS.values():
+        heavy = {}
+        category_changed = changed is None or removed_any
+        for entry in content_data.get(key, []):
+            summary = {field: entry[field] for field in SUMMARY_FIELDS if field in entry}
+            summary['chunk'] = f"entries/{_chunk_name(entry['id'])}.json"
+            summaries.append(summary)
+            heavy[entry['id']] = {field: value for field, value in entry.items() if field not in SUMMARY_FIELDS}
+            entry_changed = changed is None or entry['id'] in changed
+            category_changed = category_changed or entry_changed
+            add_chunk(summary['chunk'], entry, reuse=not entry_changed)
+        add_chunk(f"categories/{key}.json", heavy, reuse=not category_changed)
+
+    for path, raw in pending.items():
+        full_path = os.path.join(out_dir, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        atomic_write(full_path, raw)
+
+    removed = 0
+    for path in set(previous) - set(chunks):
+        full_path = os.path.join(out_dir, path)
+        if os.path.exists(full_path):
+            os.unlink(full_path)
+            removed += 1
+
+    manifest = {"entries": summaries, "chunks": chunks}
+    raw, _ = _chunk_bytes(manifest)
+    os.makedirs(out_dir, exist_ok=True)
+    atomic_write(manifest_path, raw)
+    return len(pending), len(chunks) - len(pending), removed
@@ -0,0 +1,216 @@
+"""
+Media pipeline for content.json
+Responsive WebP variants of entry photos (Pillow) and video posters
+(ffmpeg), with their metadata written back into the entries.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Any, Tuple
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # only the media command needs Pillow
+    Image = ImageOps = None
+
+from content_store import ContentStore, atomic_write, entry_hash, iter_entries
+
+# Responsive widths generated for each photo (never upscaled)
+MEDIA_WIDTHS = (480, 960, 1600)
+MEDIA_QUALITY = 80
+MEDIA_CACHE_FILE = '.media-cache.json'
+VARIANTS_DIR = '_variants'
+
+
+def file_digest(path: str) -> str:
+    """sha256 of a file's bytes, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def process_image(src: str, digest: str, widths: Tuple[int, ...] = MEDIA_WIDTHS,
+                  quality: int = MEDIA_QUALITY) -> Dict[str, Any]:
+    """Write WebP variants of one photo and return its layout metadata.
+
+    Runs in a worker process. Variant names embed the source hash, so an
+    unchanged photo always maps to the same outputs.
+    """
+    directory, filename = os.path.split(src)
+    stem = os.path.splitext(filename)[0]
+    out_dir = os.path.join(directory, VARIANTS_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+
+    with Image.open(src) as original:
+        image = ImageOps.exif_transpose(original)
+        width, height = image.size
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGB')
+
+        variants = []
+        for target in sorted({min(w, width) for w in widths}):
+            name = f"{stem}-{digest[:10]}-{target}w.webp"
+            out_path = os.path.join(out_dir, name)
+            if not os.path.exists(out_path):
+                resized = image.resize((target, round(height * target / width)), Image.LANCZOS)
+                resized.save(out_path, 'WEBP', quality=quality)
+            variants.append({"width": target, "filename": f"{VARIANTS_DIR}/{name}"})
+
+    return {"width": width, "height": height, "size": os.path.getsize(src), "variants": variants}
+
+
+def process_video(src: str, digest: str) -> Dict[str, Any]:
+    """Extract a JPEG poster frame with ffmpeg and return the video's metadata"""
+    directory, filename = os.path.split(src)
+    stem = os.path.splitext(filename)[0]
+    out_dir = os.path.join(directory, VARIANTS_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+
+    name = f"{stem}-{digest[:10]}-poster.jpg"
+    out_path = os.path.join(out_dir, name)
+    if not os.path.exists(out_path):
+        subprocess.run(['ffmpeg', '-v', 'error', '-y', '-ss', '1', '-i', src, '-frames:v', '1',
+                        '-q:v', '3', out_path], check=True, capture_output=True)
+
+    probe = subprocess.run(['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+                            '-show_entries', 'stream=width,height', '-of', 'json', src],
+                           check=True, capture_output=True, text=True)
+    stream = json.loads(probe.stdout)['streams'][0]
+    return {"width": stream['width'], "height": stream['height'], "size": os.path.getsize(src),
+            "poster": f"{VARIANTS_DIR}/{name}"}
+
+
+def _media_outputs(meta: Dict[str, Any]) -> List[str]:
+    """Relative paths of the files a cached result points at"""
+    outputs = [variant['filename'] for variant in meta.get('variants', [])]
+    if 'poster' in meta:
+        outputs.append(meta['poster'])
+    return outputs
+
+
+def build_media(content_data: Dict[str, Any], media_root: str, jobs: Optional[int] = None,
+                out=sys.stdout) -> Tuple[int, int, int]:
+    """Generate variants/posters for every photo and video the entries reference.
+
+    Photos are read from <media_root>/<entry id>/ and videos from
+    <media_root>/videos/, matching where the site serves them from.
+    Sources whose hash matches .media-cache.json are skipped; the rest are
+    processed across a process pool. Width/height/size (and variants or
+    poster) are written back into the entries. Returns (processed,
+    skipped, failed).
+    """
+    cache_path = os.path.join(media_root, MEDIA_CACHE_FILE)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        cache = {}
+
+    # Every referenced source, once, with the dicts to write metadata into
+    sources: Dict[str, List[Tuple[Dict[str, Any], str]]] = {}
+    for entry in iter_entries(content_data):
+        for photo in entry.get('photos') or []:
+            rel = f"{entry['id']}/{photo['filename']}"
+            sources.setdefault(rel, []).append((photo, 'image'))
+        if entry.get('video'):
+            sources.setdefault(f"videos/{entry['video']}", []).append((entry, 'video'))
+
+    has_ffmpeg = shutil.which('ffmpeg') and shutil.which('ffprobe')
+    results: Dict[str, Dict[str, Any]] = {}
+    todo = []
+    skipped = failed = 0
+    for rel, targets in sources.items():
+        src = os.path.join(media_root, rel)
+        try:
+            stat = os.stat(src)
+        except FileNotFoundError:
+            print(f"Missing media file: {src}", file=out)
+            failed += 1
+            continue
+
+        cached = cache.get(rel)
+        # Cheap check first: unchanged size+mtime means unchanged hash
+        if cached and cached.get('mtime_ns') == stat.st_mtime_ns and cached.get('bytes') == stat.st_size:
+            digest = cached['hash']
+        else:
+            digest = file_digest(src)
+
+        directory = os.path.dirname(src)
+        if cached and cached.get('hash') == digest and all(
+                os.path.exists(os.path.join(directory, p)) for p in _media_outputs(cached['meta'])):
+            results[rel] = cached['meta']
+            cache[rel].update(mtime_ns=stat.st_mtime_ns, bytes=stat.st_size)
+            skipped += 1
+            continue
+
+        kind = targets[0][1]
+        if kind == 'video' and not has_ffmpeg:
+            print(f"Skipping {src}: ffmpeg/ffprobe not found", file=out)
+            failed += 1
+            continue
+        todo.append((rel, src, digest, kind, stat))
+
+    processed = 0
+    if todo:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                pool.submit(process_video if kind == 'video' else process_image, src, digest):
+                    (rel, src, digest, stat)
+                for rel, src, digest, kind, stat in todo
+            }
+            for future in as_completed(futures):
+                rel, src, digest, stat = futures[future]
+                try:
+                    meta = future.result()
+                except Exception as e:
+                    print(f"Failed to process {src}: {e}", file=out)
+                    failed += 1
+                    continue
+
+                # Outputs of a previous version of this file are now orphaned
+                old = cache.get(rel)
+                if old and old.get('hash') != digest:
+                    for stale in set(_media_outputs(old['meta'])) - set(_media_outputs(meta)):
+                        stale_path = os.path.join(os.path.dirname(src), stale)
+                        if os.path.exists(stale_path):
+                            os.unlink(stale_path)
+
+                cache[rel] = {"hash": digest, "mtime_ns": stat.st_mtime_ns, "bytes": stat.st_size,
+                              "meta": meta}
+                results[rel] = meta
+                processed += 1
+
+    for rel, meta in results.items():
+        for target, kind in sources[rel]:
+            if kind == 'image':
+                target.update(meta)
+            else:
+                target['videoMeta'] = meta
+
+    atomic_write(cache_path, json.dumps(cache, indent=2).encode('utf-8'))
+    return processed, skipped, failed
+
+
+def build_store_media(store: ContentStore, content_data: Dict[str, Any], media_root: str,
+                      jobs: Optional[int] = None, out=sys.stdout) -> Tuple[int, int, int, int]:
+    """build_media over content_data (store's entries, or a subset of the same dicts).
+
+    build_media edits the entries in place, which a SQLiteStore cannot
+    see; every entry whose metadata changed is handed to store.replace()
+    so the next save() writes it. Returns (processed, skipped, failed,
+    entries changed).
+    """
+    entries = list(iter_entries(content_data))
+    before = [entry_hash(entry) for entry in entries]
+    processed, skipped, failed = build_media(content_data, media_root, jobs, out)
+    changed = [entry for entry, digest in zip(entries, before) if entry_hash(entry) != digest]
+    for entry in changed:
+        store.replace(entry['id'], entry)
+    return processed, skipped, failed, len(changed)
@@ -0,0 +1,161 @@
+"""
+Opt-in profiling for populateContent.py
+Per-operation latency histograms (--profile), plus optional cProfile and
+tracemalloc captures.
+"""
+
+import bisect
+import cProfile
+import functools
+import importlib
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Optional
+
+PROFILE_ENV = 'POPULATE_CONTENT_PROFILE'
+
+# Operations timed by --profile: "module:name" for the content modules, a
+# bare dotted name for what the populateContent.py script itself defines
+PROFILED = (
+    'content_store:ContentStore.load',
+    'content_store:ContentStore._read_snapshot',
+    'content_store:parse_content',
+    'content_store:collect_skills',
+    'ContentJSONManager.load_existing_data',
+    'AutocompleteCombobox.on_key_release',
+    'AutocompleteCombobox.refresh_matches',
+    'content_store:SkillIndex.search',
+    'ContentJSONManager.validate_form',
+    'content_store:entry_errors',
+    'ContentJSONManager.add_entry',
+    'content_store:serialize_content',
+    'content_store:ContentStore.write_document',
+    'content_store:ContentStore._append_journal',
+    'content_store:atomic_write',
+    'content_build:build_outputs',
+)
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open
+PROFILE_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class OperationStats:
+    """Latency histogram for one operation"""
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(PROFILE_BUCKETS_MS) + 1)
+
+    def record(self, ms: float):
+        self.calls += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+        self.buckets[bisect.bisect_left(PROFILE_BUCKETS_MS, ms)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of calls"""
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= fraction * self.calls:
+                return min(PROFILE_BUCKETS_MS[i], self.max) if i < len(PROFILE_BUCKETS_MS) else self.max
+        return self.max
+
+
+class Profiler:
+    """Opt-in timing of the operations in PROFILED.
+
+    install() replaces each one with a timing wrapper, so nothing is
+    measured (and nothing costs anything) unless profiling was asked for.
+    cProfile only sees the main thread; the timings also cover the save
+    thread.
+    """
+
+    def __init__(self, cpu_path: Optional[str] = None, memory: bool = False):
+        self.cpu_path = cpu_path
+        self.memory = memory
+        self.stats: Dict[str, OperationStats] = {}
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self._cpu: Optional[cProfile.Profile] = None
+
+    def record(self, name: str, ms: float):
+        with self.lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = OperationStats()
+            stats.record(ms)
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, (time.perf_counter() - start) * 1000)
+        return timed
+
+    def install(self, names=PROFILED, namespace: Optional[Dict[str, Any]] = None):
+        """Wrap each named callable; bare names are looked up in namespace.
+
+        A wrapped function also replaces every module-level reference to
+        it, so calls from the modules that imported it are timed too.
+        """
+        for name in names:
+            module_name, _, path = name.rpartition(':')
+            scope = vars(importlib.import_module(module_name)) if module_name else namespace
+            if scope is None:
+                continue
+            owner_name, _, attr = path.rpartition('.')
+            if owner_name:
+                owner = scope[owner_name]
+                setattr(owner, attr, self.wrap(path, getattr(owner, attr)))
+                continue
+
+            original = scope[attr]
+            timed = self.wrap(path, original)
+            scope[attr] = timed
+            for module in list(sys.modules.values()):
+                if getattr(module, '__dict__', {}).get(attr) is original:
+                    setattr(module, attr, timed)
+
+    def start(self, namespace: Optional[Dict[str, Any]] = None):
+        self.install(namespace=namespace)
+        if self.memory:
+            tracemalloc.start()
+        if self.cpu_path:
+            self._cpu = cProfile.Profile()
+            self._cpu.enable()
+
+    def report(self, out):
+        """Stop any cProfile/tracemalloc capture and print the summary"""
+        if self._cpu is not None:
+            self._cpu.disable()
+            self._cpu.dump_stats(self.cpu_path)
+
+        elapsed = time.perf_counter() - self.started
+        print(f"\nProfile ({elapsed:.2f} s wall clock, times in ms):", file=out)
+        print(f"{'operation':<40} {'calls':>7} {'total':>10} {'mean':>9} {'p50<=':>8} {'p95<=':>8} {'max':>9}", file=out)
+        with self.lock:
+            stats = sorted(self.stats.items(), key=lambda item: -item[1].total)
+        for name, op in stats:
+            print(f"{name:<40} {op.calls:>7} {op.total:>10.2f} {op.total / op.calls:>9.3f}"
+                  f" {op.percentile(0.5):>8.3g} {op.percentile(0.95):>8.3g} {op.max:>9.3f}", file=out)
+            bounds = [f"<={b:g}" for b in PROFILE_BUCKETS_MS] + [f">{PROFILE_BUCKETS_MS[-1]:g}"]
+            histogram = '  '.join(f"{bound}:{count}" for bound, count in zip(bounds, op.buckets) if count)
+            print(f"    {histogram}", file=out)
+
+        if self.memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"\nPeak traced memory: {peak / 1024:.0f} KiB; top allocations:", file=out)
+            for stat in snapshot.statistics('lineno')[:10]:
+                print(f"    {stat}", file=out)
+        if self.cpu_path:
+            print(f"\ncProfile stats written to {self.cpu_path} (python -m pstats {self.cpu_path})", file=out)
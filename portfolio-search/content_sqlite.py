@@ -0,0 +1,310 @@
+"""
+SQLite storage for content.json
+SQLiteStore keeps the entries in a database (populateContent.py --db) and
+exports content.json from it.
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Any
+
+from content_store import (
+    CATEGORY_KEYS, ContentStore, atomic_write, collect_skills, serialize_content, skill_key
+)
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    category_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    type TEXT,
+    title TEXT NOT NULL DEFAULT '',
+    detail TEXT NOT NULL DEFAULT '',
+    relevance INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_order ON entries (category_key, position);
+CREATE INDEX IF NOT EXISTS entries_type ON entries (type);
+CREATE TABLE IF NOT EXISTS skills (
+    entry_rowid INTEGER NOT NULL REFERENCES entries (rowid) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS skills_key ON skills (key);
+CREATE INDEX IF NOT EXISTS skills_entry ON skills (entry_rowid);
+CREATE TABLE IF NOT EXISTS links (
+    entry_rowid INTEGER PRIMARY KEY REFERENCES entries (rowid) ON DELETE CASCADE,
+    url TEXT NOT NULL,
+    label TEXT NOT NULL
+);
+"""
+
+# Full-text search over title and detail; skipped if SQLite lacks FTS5
+SQLITE_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5 (
+    title, detail, content='entries', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS entries_fts_insert AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts (rowid, title, detail) VALUES (new.rowid, new.title, new.detail);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_fts_delete AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts (entries_fts, rowid, title, detail) VALUES ('delete', old.rowid, old.title, old.detail);
+END;
+"""
+
+
+class SQLiteStore(ContentStore):
+    """ContentStore backed by a SQLite database instead of content.json.
+
+    Each entry is a row holding its JSON (key order intact, so the export
+    is byte-for-byte what a JSON-backed store would write) plus the
+    columns worth querying; skills and links get their own tables, and
+    title/detail are indexed with FTS5 when available. Every commit is
+    its own transaction that touches only the rows it changes, so several
+    editors can share one file; content.json is an export of the
+    database, rewritten by save() and every compact_every changes like a
+    journal compaction. Entries added, replaced or removed in memory
+    without a commit (bulk ingest, media metadata through
+    build_store_media) are written by the next save(); edits made to an
+    entry dict in place are not seen.
+    """
+
+    def __init__(self, file_path: str = "content.json", db_path: str = "content.db",
+                 compact_every: int = 50):
+        super().__init__(file_path, journal=True, compact_every=compact_every, snapshot=False)
+        self.db_path = db_path
+        self._schema_ready = False
+        self._unsaved: Dict[str, None] = {}  # ids changed in memory only, in change order
+
+    def connect(self) -> sqlite3.Connection:
+        """Open the database, creating the schema on first use.
+
+        Connections are opened per operation, so the writer thread and
+        the UI thread never share one.
+        """
+        db = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        db.execute("PRAGMA foreign_keys = ON")
+        if not self._schema_ready:
+            db.execute("PRAGMA journal_mode = WAL")  # readers do not block the writer
+            db.executescript(SQLITE_SCHEMA)
+            try:
+                db.executescript(SQLITE_FTS_SCHEMA)
+            except sqlite3.OperationalError:
+                pass  # no FTS5 in this SQLite build; query() falls back to LIKE
+            self._schema_ready = True
+        return db
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """A connection inside BEGIN IMMEDIATE ... COMMIT (ROLLBACK on error)"""
+        db = self.connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+        finally:
+            db.close()
+
+    def load(self):
+        """Load every entry from the database (FileNotFoundError if it does not exist)"""
+        if not os.path.exists(self.db_path):
+            raise FileNotFoundError(self.db_path)
+        self._skills = None
+        with self.transaction() as db:
+            self.content_data = self._read_document(db)
+        self.all_skills.update(collect_skills(self.content_data))
+        self.base_hash = None
+        self.pending = 0
+        self._unsaved = {}
+        self.rebuild_id_index()
+
+    def add(self, entry: Dict[str, Any]):
+        super().add(entry)
+        self._unsaved[entry['id']] = None
+
+    def remove(self, entry_id: str) -> Dict[str, Any]:
+        entry = super().remove(entry_id)
+        self._unsaved[entry_id] = None
+        return entry
+
+    def replace(self, entry_id: str, entry: Dict[str, Any]):
+        super().replace(entry_id, entry)
+        self._unsaved[entry_id] = None
+        self._unsaved[entry['id']] = None
+
+    def _take_unsaved(self) -> List[Dict[str, Any]]:
+        """Change records for the in-memory edits no commit has written yet"""
+        records = []
+        for entry_id in self._unsaved:
+            entry = self.get(entry_id)
+            records.append({'op': 'delete', 'id': entry_id} if entry is None else {'op': 'update', 'entry': entry})
+        self._unsaved = {}
+        return records
+
+    @staticmethod
+    def _read_keys(db: sqlite3.Connection) -> List[str]:
+        """Top-level keys of content.json, in file order"""
+        row = db.execute("SELECT value FROM meta WHERE key = 'keys'").fetchone()
+        return json.loads(row[0]) if row else list(CATEGORY_KEYS.values())
+
+    @classmethod
+    def _read_document(cls, db: sqlite3.Connection) -> Dict[str, List[Dict[str, Any]]]:
+        document = {key: [] for key in cls._read_keys(db)}
+        for key, data in db.execute("SELECT category_key, data FROM entries ORDER BY category_key, position"):
+            document.setdefault(key, []).append(json.loads(data))
+        return document
+
+    @staticmethod
+    def _write_entry(db: sqlite3.Connection, key: str, entry: Dict[str, Any], data: str,
+                     replaces: Optional[str] = None):
+        """Insert entry in place of the row with id replaces (default: its own id).
+
+        The entry keeps that row's position unless it moved category, in
+        which case it goes to the end, like ContentStore.replace().
+        """
+        replaces = replaces or entry['id']
+        old = db.execute("SELECT category_key, position FROM entries WHERE id = ?", (replaces,)).fetchone()
+        db.execute("DELETE FROM entries WHERE id IN (?, ?)", (replaces, entry['id']))
+        if old is not None and old[0] == key:
+            position = old[1]
+        else:
+            position = db.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM entries WHERE category_key = ?",
+                                  (key,)).fetchone()[0]
+
+        relevance = entry.get('relevance')
+        rowid = db.execute(
+            "INSERT INTO entries (id, category_key, position, type, title, detail, relevance, data)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (entry['id'], key, position, entry.get('type'), str(entry.get('title') or ''),
+             str(entry.get('detail') or ''), relevance if isinstance(relevance, int) else None, data)
+        ).lastrowid
+        db.executemany("INSERT INTO skills (entry_rowid, position, name, key) VALUES (?, ?, ?, ?)",
+                       [(rowid, i, skill, skill_key(skill))
+                        for i, skill in enumerate(entry.get('skills') or []) if isinstance(skill, str)])
+        link = entry.get('link')
+        if isinstance(link, dict) and 'url' in link:
+            db.execute("INSERT INTO links (entry_rowid, url, label) VALUES (?, ?, ?)",
+                       (rowid, link['url'], link.get('label', '')))
+
+    def _persist(self, record: Dict[str, Any]):
+        """Apply the change to the database; export content.json now and then"""
+        # The record carries the change, so save() has nothing left to write for it
+        self._unsaved.pop(record.get('id'), None)
+        if 'entry' in record:
+            self._unsaved.pop(record['entry']['id'], None)
+        if self.writer is not None:
+            # A call, not an append: the writer drops appends that precede
+            # a save, but never calls
+            self.writer.call(lambda: self._append_journal(record))
+        else:
+            self._append_journal(record)
+        self.pending += 1
+        if self.pending >= self.compact_every:
+            self.request_save()
+
+    def _append_journal(self, record: Dict[str, Any]):
+        """Apply one change record in its own transaction"""
+        self._write_records([record])
+
+    def _write_records(self, records: List[Dict[str, Any]]):
+        """Apply change records to the database in one transaction"""
+        with self.transaction() as db:
+            for record in records:
+                if record.get('op') == 'delete':
+                    db.execute("DELETE FROM entries WHERE id = ?", (record['id'],))
+                    continue
+                entry = record['entry']
+                data = json.dumps(entry, ensure_ascii=False)
+                self._write_entry(db, CATEGORY_KEYS[entry['type']], entry, data, record.get('id'))
+
+    def request_save(self):
+        if self.writer is not None:
+            records = self._take_unsaved()
+            if records:
+                self.writer.call(lambda: self._write_records(records))
+        super().request_save()
+
+    def save(self, file_path: Optional[str] = None):
+        """Write the uncommitted in-memory changes, then export content.json"""
+        records = self._take_unsaved()
+        if records:
+            self._write_records(records)
+        super().save(file_path)
+
+    def write_document(self, document: Dict[str, Any], skills: set):
+        """Export content.json from the database.
+
+        document is ignored: every change is already in the database, and
+        this store's copy may be older than another editor's commits.
+        """
+        with self.transaction() as db:
+            exported = self._read_document(db)
+        atomic_write(self.file_path, serialize_content(exported))
+
+    def import_document(self, document: Dict[str, Any], replace: bool = False) -> int:
+        """One-shot import of a content.json document; returns the entries imported.
+
+        Raises ValueError if the database already has entries (unless
+        replace) or an entry has no id or repeats one.
+        """
+        with self.transaction() as db:
+            if db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]:
+                if not replace:
+                    raise ValueError(f"{self.db_path} already has entries")
+                db.execute("DELETE FROM entries")
+            count = 0
+            for key, category in document.items():
+                for position, entry in enumerate(category):
+                    if not isinstance(entry, dict) or not isinstance(entry.get('id'), str):
+                        raise ValueError(f"{key}[{position}]: entry has no id")
+                    if db.execute("SELECT 1 FROM entries WHERE id = ?", (entry['id'],)).fetchone():
+                        raise ValueError(f"{key}[{position}]: duplicate id {entry['id']!r}")
+                    self._write_entry(db, key, entry, json.dumps(entry, ensure_ascii=False))
+                    count += 1
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('keys', ?)",
+                       (json.dumps(list(document)),))
+        return count
+
+    def query(self, entry_type: Optional[str] = None, skill: Optional[str] = None,
+              text: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Entries matching every given filter: in file order, or best text match first"""
+        joins, where, params = [], [], []
+        order = "e.category_key, e.position"  # regrouped in file order below
+        if entry_type:
+            where.append("e.type = ?")
+            params.append(entry_type)
+        if skill:
+            where.append("e.rowid IN (SELECT entry_rowid FROM skills WHERE key = ?)")
+            params.append(skill_key(skill))
+        with self.transaction() as db:
+            has_fts = db.execute("SELECT 1 FROM sqlite_master WHERE name = 'entries_fts'").fetchone()
+            if text and has_fts:
+                joins.append("JOIN entries_fts ON entries_fts.rowid = e.rowid")
+                # Quote each word so punctuation ("C++", "Node.js") is not FTS syntax
+                where.append("entries_fts MATCH ?")
+                params.append(' '.join('"' + word.replace('"', '""') + '"' for word in text.split()))
+                order = "bm25(entries_fts)"
+            elif text:
+                for word in text.split():
+                    where.append("(e.title LIKE ? OR e.detail LIKE ?)")
+                    params += [f"%{word}%"] * 2
+            sql = f"SELECT e.category_key, e.data FROM entries e {' '.join(joins)}"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            rows = db.execute(f"{sql} ORDER BY {order}", params).fetchall()
+            keys = self._read_keys(db)
+        if not (text and has_fts):
+            rows.sort(key=lambda row: keys.index(row[0]) if row[0] in keys else len(keys))
+        return [json.loads(data) for _, data in rows]
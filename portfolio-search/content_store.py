@@ -0,0 +1,1034 @@
+"""
+Content store for content.json
+The Tk-free core of populateContent.py: the entry rules, the journaled
+ContentStore and its save thread, bulk ingest, whole-file validation and
+the skill lookups the editor autocompletes from.
+"""
+
+import bisect
+import csv
+import hashlib
+import heapq
+import json
+import marshal
+import os
+import queue
+import re
+import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple
+
+# Entry type -> top-level key in content.json
+CATEGORY_KEYS = {
+    'experience': 'experiences',
+    'project': 'projects',
+    'education': 'education',
+    'about': 'about'
+}
+
+# Entry type -> category shown on the site when none is given
+DEFAULT_CATEGORIES = {
+    'experience': 'Work Experience',
+    'project': 'Projects',
+    'education': 'Education',
+    'about': 'About'
+}
+
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}$')
+
+
+def empty_content() -> Dict[str, List[Dict[str, Any]]]:
+    """Return an empty content document with every category present"""
+    return {key: [] for key in CATEGORY_KEYS.values()}
+
+
+def iter_entries(content_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield every entry in the same order as getAllContent on the site"""
+    for key in CATEGORY_KEYS.values():
+        yield from content_data.get(key, [])
+
+
+def slugify(title: str) -> str:
+    """Convert a title to an id: lowercase, hyphenated, no special chars"""
+    slug = re.sub(r'[^a-z0-9\s-]', '', title.lower())
+    return re.sub(r'\s+', '-', slug.strip())
+
+
+def validate_date_format(date_str: str) -> bool:
+    """Validate date format YYYY-MM"""
+    if not date_str:
+        return True  # Empty is allowed for optional fields
+
+    if not DATE_PATTERN.match(date_str):
+        return False
+
+    try:
+        year, month = map(int, date_str.split('-'))
+        return 1 <= month <= 12 and 1900 <= year <= 2100
+    except ValueError:
+        return False
+
+
+def _text(fields: Dict[str, Any], key: str) -> str:
+    """Read a field as stripped text, treating missing/None as empty"""
+    value = fields.get(key)
+    return '' if value is None else str(value).strip()
+
+
+def entry_errors(fields: Dict[str, Any], existing_ids=None, stored: bool = False,
+                 current_id: Optional[str] = None, null_start: bool = False) -> List[str]:
+    """Every rule violation in an entry, in the order the form reports them.
+
+    existing_ids (any container of ids already in use) enables the
+    duplicate-id check; current_id is the id of the entry being edited,
+    which may keep its own id. stored=True checks an entry as it sits in
+    content.json rather than as raw form input: startDate may be null (as
+    the site's ContentItem allows), relevance must be a real integer and a
+    link must carry both url and label. null_start=True applies just the
+    startDate rule to form input, for edits of entries stored without one.
+    """
+    errors = []
+
+    # Required fields
+    entry_id = _text(fields, 'id')
+    if not entry_id:
+        errors.append("ID is required")
+    elif existing_ids is not None and entry_id != current_id and entry_id in existing_ids:
+        errors.append(f"ID '{entry_id}' is already used by another entry")
+    if not _text(fields, 'title'):
+        errors.append("Title is required")
+    if not _text(fields, 'company'):
+        errors.append("Company is required")
+    entry_type = _text(fields, 'type')
+    if not entry_type:
+        errors.append("Type is required")
+    elif entry_type not in CATEGORY_KEYS:
+        errors.append(f"Type must be one of: {', '.join(CATEGORY_KEYS)}")
+    if not _text(fields, 'category'):
+        errors.append("Category is required")
+    if not _text(fields, 'startDate') and not ((stored or null_start) and fields.get('startDate', '') is None):
+        errors.append("Start Date is required")
+    if not _text(fields, 'detail'):
+        errors.append("Detail is required")
+    skills = fields.get('skills')
+    if not skills:
+        errors.append("At least one skill is required")
+    elif stored and (not isinstance(skills, list) or not all(isinstance(s, str) and s.strip() for s in skills)):
+        errors.append("Skills must be a list of non-empty strings")
+
+    # Date validation
+    if not validate_date_format(_text(fields, 'startDate')):
+        errors.append("Start Date must be in format YYYY-MM")
+
+    end_date = _text(fields, 'endDate')
+    if end_date and not validate_date_format(end_date):
+        errors.append("End Date must be in format YYYY-MM")
+
+    # Relevance validation
+    relevance = fields.get('relevance')
+    if stored and relevance is not None and (isinstance(relevance, bool) or not isinstance(relevance, int)):
+        errors.append("Relevance must be a number")
+    elif _text(fields, 'relevance'):
+        try:
+            rel_int = int(_text(fields, 'relevance'))
+            if not 1 <= rel_int <= 5:
+                errors.append("Relevance must be between 1 and 5")
+        except ValueError:
+            errors.append("Relevance must be a number")
+
+    # Link validation (the form silently drops half-filled links)
+    link = fields.get('link')
+    if stored and link is not None:
+        if not isinstance(link, dict) or not _text(link, 'url') or not _text(link, 'label'):
+            errors.append("Link must have both a URL and a label")
+
+    return errors
+
+
+def validate_entry(fields: Dict[str, Any], existing_ids=None, current_id: Optional[str] = None,
+                   null_start: bool = False) -> Tuple[bool, str]:
+    """Validate entry fields, with the same rules and messages as the form.
+
+    existing_ids (any container of ids already in use) enables the
+    duplicate-id check; current_id is the id of the entry being edited.
+    null_start=True accepts a startDate of None (see entry_errors).
+    """
+    errors = entry_errors(fields, existing_ids, current_id=current_id, null_start=null_start)
+    if errors:
+        return False, errors[0]
+    return True, ""
+
+
+def build_entry(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a content.json entry from validated fields"""
+    entry = {
+        "id": _text(fields, 'id'),
+        "title": _text(fields, 'title'),
+        "company": _text(fields, 'company'),
+        "startDate": None if fields.get('startDate', '') is None else _text(fields, 'startDate'),
+        "detail": _text(fields, 'detail'),
+        "skills": list(fields['skills']),
+        "type": _text(fields, 'type'),
+        "category": _text(fields, 'category')
+    }
+
+    # Add optional fields
+    end_date = _text(fields, 'endDate')
+    if end_date:
+        entry["endDate"] = end_date
+
+    date_range = _text(fields, 'dateRange')
+    if date_range:
+        entry["dateRange"] = date_range
+
+    relevance = _text(fields, 'relevance')
+    if relevance:
+        entry["relevance"] = int(relevance)
+
+    # Add link if provided
+    link = fields.get('link') or {}
+    link_url = _text(link, 'url')
+    link_label = _text(link, 'label')
+    if link_url and link_label:
+        entry["link"] = {
+            "url": link_url,
+            "label": link_label
+        }
+
+    return entry
+
+
+def normalize_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a raw ingest record (JSONL object or CSV row) onto entry fields.
+
+    Skills may be a list or a ';'-separated string, the link may be given
+    as a {"url", "label"} object or as link_url/link_label columns, and
+    id/category are derived from title/type when left blank.
+    """
+    fields = dict(record)
+
+    skills = fields.get('skills') or []
+    if isinstance(skills, str):
+        skills = skills.split(';')
+    fields['skills'] = [str(s).strip() for s in skills if str(s).strip()]
+
+    link = fields.get('link')
+    if not isinstance(link, dict):
+        link = {'url': fields.pop('link_url', ''), 'label': fields.pop('link_label', '')}
+    fields['link'] = link
+
+    if not _text(fields, 'id') and _text(fields, 'title'):
+        fields['id'] = slugify(_text(fields, 'title'))
+    if not _text(fields, 'category') and _text(fields, 'type') in DEFAULT_CATEGORIES:
+        fields['category'] = DEFAULT_CATEGORIES[_text(fields, 'type')]
+
+    return fields
+
+
+def iter_records(path: str, fmt: Optional[str] = None) -> Iterator[Tuple[int, Optional[Dict[str, Any]], str]]:
+    """Stream (line number, record, error) tuples from a JSONL or CSV file.
+
+    Records are read one at a time so large migrations never sit in memory
+    as a whole; unparseable lines are yielded with an error instead of
+    stopping the stream.
+    """
+    fmt = fmt or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if fmt == 'csv':
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row, ""
+            return
+
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, None, "Record must be a JSON object"
+                continue
+            yield line_no, record, ""
+
+
+SKILL_ALIASES_FILE = 'skill-aliases.json'
+
+
+def skill_key(skill: str) -> str:
+    """Case- and whitespace-insensitive form of a skill name"""
+    return ' '.join(skill.split()).casefold()
+
+
+def load_skill_aliases(file_path: str) -> Dict[str, str]:
+    """Read skill-aliases.json ({"alias": "Canonical Name"}) next to content.json"""
+    path = os.path.join(os.path.dirname(file_path), SKILL_ALIASES_FILE)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            aliases = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return {str(alias): str(name) for alias, name in aliases.items()}
+
+
+class SkillRegistry:
+    """Canonical skills with a reverse index to the entries that use them.
+
+    Skills are keyed by skill_key(), so "Python" and "python " are one
+    skill, and skill-aliases.json can fold further variants ("JS") into a
+    canonical skill ("JavaScript"). Each skill shows under its alias-table
+    name, or else its most used spelling.
+    """
+
+    def __init__(self, aliases: Optional[Dict[str, str]] = None):
+        aliases = aliases or {}
+        self.alias_table = dict(aliases)  # as given, for state()
+        self.aliases = {skill_key(alias): skill_key(name) for alias, name in aliases.items()}
+        self.alias_names = {skill_key(name): name for name in aliases.values()}
+        self.entries: Dict[str, Dict[str, None]] = {}  # key -> ordered set of ids
+        self.spellings: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def build(cls, content_data: Dict[str, Any], aliases: Optional[Dict[str, str]] = None) -> 'SkillRegistry':
+        registry = cls(aliases)
+        for entry in iter_entries(content_data):
+            registry.add(entry)
+        return registry
+
+    @classmethod
+    def restore(cls, state: Dict[str, Any]) -> 'SkillRegistry':
+        """Rebuild a registry from state() output, without visiting the entries"""
+        registry = cls(state['aliases'])
+        registry.entries = state['entries']
+        registry.spellings = state['spellings']
+        return registry
+
+    def state(self) -> Dict[str, Any]:
+        """Marshal-friendly state for restore()"""
+        return {'aliases': self.alias_table, 'entries': self.entries, 'spellings': self.spellings}
+
+    def canonical(self, skill: str) -> str:
+        key = skill_key(skill)
+        return self.aliases.get(key, key)
+
+    def name(self, key: str) -> str:
+        if key in self.alias_names:
+            return self.alias_names[key]
+        spellings = self.spellings.get(key)
+        if not spellings:
+            return key
+        return max(spellings, key=spellings.get)  # ties: first seen
+
+    def resolve(self, skill: str) -> str:
+        """The name to store for a typed skill: the known spelling if any"""
+        key = self.canonical(skill)
+        if key in self.entries or key in self.alias_names:
+            return self.name(key)
+        return ' '.join(skill.split())
+
+    def resolve_all(self, skills: List[str]) -> List[str]:
+        """resolve() each skill, dropping later ones that are the same skill"""
+        resolved: Dict[str, str] = {}
+        for skill in skills:
+            resolved.setdefault(self.canonical(skill), self.resolve(skill))
+        return list(resolved.values())
+
+    def names(self) -> List[str]:
+        return [self.name(key) for key in self.entries]
+
+    def count(self, skill: str) -> int:
+        return len(self.entries.get(self.canonical(skill), ()))
+
+    def add(self, entry: Dict[str, Any]):
+        for skill in entry.get('skills') or []:
+            key = self.canonical(skill)
+            self.entries.setdefault(key, {})[entry['id']] = None
+            spellings = self.spellings.setdefault(key, {})
+            spellings[skill] = spellings.get(skill, 0) + 1
+
+    def remove(self, entry: Dict[str, Any]):
+        for skill in entry.get('skills') or []:
+            key = self.canonical(skill)
+            self.entries.get(key, {}).pop(entry['id'], None)
+            spellings = self.spellings.get(key, {})
+            if spellings.get(skill, 0) > 1:
+                spellings[skill] -= 1
+            else:
+                spellings.pop(skill, None)
+            if not self.entries.get(key):
+                self.entries.pop(key, None)
+                self.spellings.pop(key, None)
+
+    def to_json(self, lookup: Callable[[str], Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Export for the skills pages.
+
+        Entry ids per skill are pre-sorted the way getContentBySkill sorts
+        (relevance, then title); lookup resolves an id to its entry.
+        """
+        def order(entry_id: str):
+            entry = lookup(entry_id) or {}
+            return -(entry.get('relevance') or 0), str(entry.get('title', '')).casefold()
+
+        skills = {}
+        for key in sorted(self.entries):
+            ids = sorted(self.entries[key], key=order)
+            skills[key] = {"name": self.name(key), "count": len(ids), "entries": ids}
+        top = sorted(skills, key=lambda key: (-skills[key]['count'], skills[key]['name'].casefold()))
+        return {"skills": skills, "aliases": dict(sorted(self.aliases.items())), "top": top}
+
+
+def _fsync_dir(path: str):
+    """Flush a directory entry so a rename survives power loss (POSIX only)"""
+    try:
+        fd = os.open(path or '.', os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(file_path: str, data: bytes):
+    """Write data to file_path via a temp file and rename.
+
+    Readers (and a crash mid-write) only ever see the old or the new file,
+    never a truncated one.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(file_path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600; keep the target's mode (or the umask default)
+        try:
+            mode = os.stat(file_path).st_mode & 0o777
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    _fsync_dir(directory)
+
+
+def serialize_content(content_data: Dict[str, Any]) -> bytes:
+    """Serialize the document exactly as it is written to content.json"""
+    return json.dumps(content_data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def index_ids(content_data: Dict[str, Any]) -> Dict[str, Tuple[str, int]]:
+    """Map every id to (category key, position); first occurrence wins"""
+    id_index: Dict[str, Tuple[str, int]] = {}
+    for key, category in content_data.items():
+        for position, item in enumerate(category):
+            if isinstance(item, dict) and 'id' in item:
+                id_index.setdefault(item['id'], (key, position))
+    return id_index
+
+
+def entry_hash(entry: Dict[str, Any]) -> str:
+    """Short, stable fingerprint of an entry's content"""
+    data = json.dumps(entry, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha1(data).hexdigest()[:12]
+
+
+def parse_content(raw: bytes) -> Dict[str, Any]:
+    """Parse the bytes of content.json"""
+    return json.loads(raw.decode('utf-8'))
+
+
+def collect_skills(content_data: Dict[str, Any]) -> set:
+    """Every skill used by any entry"""
+    skills = set()
+    for category in content_data.values():
+        for item in category:
+            if 'skills' in item:
+                skills.update(item['skills'])
+    return skills
+
+
+class ContentStore:
+    """content.json held in memory, independent of any GUI.
+
+    With journal=True, commit() appends each new entry to an fsync'd
+    sidecar log (<file>.journal) instead of rewriting the whole file, and
+    the log is folded back into content.json by compact() every
+    compact_every entries. The journal starts with a header recording the
+    hash of the content.json it applies on top of, so a crash between the
+    rename and the journal removal cannot replay entries twice.
+
+    id_index maps every id to its (category key, position) so lookups and
+    duplicate checks never scan the categories.
+
+    With snapshot=True, a marshal snapshot of the parsed document, its
+    skill vocabulary and its skill registry is kept in .<file>.snapshot,
+    keyed by the file's mtime, size and hash. An unchanged file then loads
+    with one read and no JSON parsing or registry build; a stale snapshot
+    falls back to json and is rewritten on a background thread. The
+    registry is only restored while skill-aliases.json still matches.
+    """
+
+    SNAPSHOT_VERSION = 2
+
+    def __init__(self, file_path: str = "content.json", journal: bool = False,
+                 compact_every: int = 50, snapshot: bool = True):
+        self.file_path = file_path
+        self.journal = journal
+        self.compact_every = compact_every
+        self.snapshot = snapshot
+        self._snapshot_thread: Optional[threading.Thread] = None
+        self.content_data = empty_content()
+        self.all_skills = set()
+        self.pending = 0  # journal records not yet compacted
+        self.base_hash: Optional[str] = None
+        self.id_index: Dict[str, Tuple[str, int]] = {}
+        self.writer: Optional['SaveWorker'] = None
+        self._skills: Optional[SkillRegistry] = None
+
+    @property
+    def journal_path(self) -> str:
+        return self.file_path + '.journal'
+
+    @property
+    def skills(self) -> SkillRegistry:
+        """Canonical skill registry, built on first use and kept current after"""
+        if self._skills is None:
+            self._skills = SkillRegistry.build(self.content_data, load_skill_aliases(self.file_path))
+        return self._skills
+
+    @property
+    def snapshot_path(self) -> str:
+        directory, name = os.path.split(self.file_path)
+        return os.path.join(directory, f".{name}.snapshot")
+
+    def load(self):
+        """Load the file, raising FileNotFoundError/JSONDecodeError as json does.
+
+        Any journal records that have not been compacted yet are replayed
+        on top of the file.
+        """
+        self._skills = None
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            if not os.path.exists(self.journal_path):
+                raise
+            stat = None
+
+        snapshot = self._read_snapshot(stat) if self.snapshot and stat else None
+        if snapshot is not None:
+            self.content_data = snapshot['content']
+            self.base_hash = snapshot['sha1']
+            self.all_skills.update(snapshot['skills'])
+            if snapshot['registry']['aliases'] == load_skill_aliases(self.file_path):
+                self._skills = SkillRegistry.restore(snapshot['registry'])
+        elif stat is None:
+            self.content_data = empty_content()
+            self.base_hash = None
+        else:
+            with open(self.file_path, 'rb') as f:
+                raw = f.read()
+            self.content_data = parse_content(raw)
+            self.base_hash = hashlib.sha1(raw).hexdigest()
+
+            # Extract all existing skills for autocomplete
+            skills = collect_skills(self.content_data)
+            self.all_skills.update(skills)
+
+            if self.snapshot:
+                self._skills = SkillRegistry.build(self.content_data, load_skill_aliases(self.file_path))
+                self._write_snapshot(stat, self.base_hash, skills)
+
+        self.rebuild_id_index()
+        self.pending = self._replay_journal()
+
+    def _read_snapshot(self, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+        """Return the snapshot if it still describes the file on disk"""
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get('version') != self.SNAPSHOT_VERSION:
+            return None
+        if snapshot.get('size') != stat.st_size:
+            return None
+        if snapshot.get('mtime_ns') == stat.st_mtime_ns:
+            return snapshot
+
+        # Touched but maybe not changed: the hash decides, still without parsing
+        with open(self.file_path, 'rb') as f:
+            if hashlib.sha1(f.read()).hexdigest() != snapshot.get('sha1'):
+                return None
+        snapshot['mtime_ns'] = stat.st_mtime_ns
+        self._write_snapshot_data(marshal.dumps(snapshot))
+        return snapshot
+
+    def _write_snapshot(self, stat: os.stat_result, sha1: str, skills: set,
+                        document: Optional[Dict[str, Any]] = None):
+        """Snapshot document (default: the just-loaded, unmodified content_data).
+
+        The marshal dump happens here, before anything can mutate the
+        document; only the disk write is left to the background thread.
+        The registry is this store's own when it describes document, and
+        is built from document otherwise (a SaveWorker copy).
+        """
+        if self._skills is not None and (document is None or document is self.content_data):
+            registry = self._skills
+        else:
+            registry = SkillRegistry.build(document, load_skill_aliases(self.file_path))
+        data = marshal.dumps({
+            'version': self.SNAPSHOT_VERSION,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha1': sha1,
+            'skills': sorted(skills),
+            'registry': registry.state(),
+            'content': self.content_data if document is None else document
+        })
+        self._write_snapshot_data(data)
+
+    def _write_snapshot_data(self, data: bytes):
+        def write():
+            try:
+                atomic_write(self.snapshot_path, data)
+            except OSError:
+                pass  # the snapshot is only a cache
+        self.wait_for_snapshot()
+        self._snapshot_thread = threading.Thread(target=write, name="snapshot-writer")
+        self._snapshot_thread.start()
+
+    def wait_for_snapshot(self):
+        """Block until a background snapshot write has finished"""
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+            self._snapshot_thread = None
+
+    def rebuild_id_index(self):
+        """Map every id to (category key, position); first occurrence wins"""
+        self.id_index = index_ids(self.content_data)
+
+    def get(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        """Look up an entry by id"""
+        location = self.id_index.get(entry_id)
+        if location is None:
+            return None
+        key, position = location
+        return self.content_data[key][position]
+
+    def _replay_journal(self) -> int:
+        """Apply journal records to content_data, returning how many applied"""
+        try:
+            f = open(self.journal_path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return 0
+
+        applied = 0
+        same_base = False
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn write from a crash; skip it
+                if 'base' in record:
+                    same_base = record['base'] == self.base_hash
+                    continue
+
+                # A journal written against an older file may already have been
+                # folded in (crash after compaction); only apply what is missing
+                op = record.get('op', 'add')
+                if op == 'delete':
+                    if record.get('id') in self.id_index:
+                        self.remove(record['id'])
+                        applied += 1
+                    continue
+                entry = record.get('entry')
+                if not isinstance(entry, dict) or entry.get('type') not in CATEGORY_KEYS:
+                    continue
+                if op == 'update':
+                    if self.get(entry.get('id')) != entry and record.get('id') in self.id_index:
+                        self.replace(record['id'], entry)
+                        applied += 1
+                    continue
+                if not same_base and entry.get('id') in self.id_index:
+                    continue  # already folded in, perhaps edited since by a later record
+                self.add(entry)
+                applied += 1
+        return applied
+
+    def add(self, entry: Dict[str, Any]):
+        """Append an entry to its category (in memory only)"""
+        key = CATEGORY_KEYS[entry['type']]
+        category = self.content_data.setdefault(key, [])
+        category.append(entry)
+        self.id_index.setdefault(entry['id'], (key, len(category) - 1))
+        self.all_skills.update(entry['skills'])
+        if self._skills is not None:
+            self._skills.add(entry)
+
+    def remove(self, entry_id: str) -> Dict[str, Any]:
+        """Remove an entry by id (in memory only) and return it"""
+        key, position = self.id_index.pop(entry_id)
+        category = self.content_data[key]
+        entry = category.pop(position)
+        if self._skills is not None:
+            self._skills.remove(entry)
+        # Only the entries after it in the same category move
+        for i in range(position, len(category)):
+            item_id = category[i].get('id')
+            if self.id_index.get(item_id) == (key, i + 1):
+                self.id_index[item_id] = (key, i)
+        return entry
+
+    def replace(self, entry_id: str, entry: Dict[str, Any]):
+        """Swap the entry with entry_id for entry (in memory only).
+
+        The entry keeps its position unless its type moves it to another
+        category, in which case it is appended there.
+        """
+        key, position = self.id_index[entry_id]
+        if CATEGORY_KEYS[entry['type']] != key:
+            self.remove(entry_id)
+            self.add(entry)
+            return
+
+        if self._skills is not None:
+            self._skills.remove(self.content_data[key][position])
+            self._skills.add(entry)
+        self.content_data[key][position] = entry
+        if entry['id'] != entry_id:
+            del self.id_index[entry_id]
+            self.id_index[entry['id']] = (key, position)
+        self.all_skills.update(entry['skills'])
+
+    def document(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Shallow copy of content_data that later add() calls will not touch"""
+        return {key: list(category) for key, category in self.content_data.items()}
+
+    def commit(self, entry: Dict[str, Any]):
+        """Add an entry and persist it: journal append or full save.
+
+        With a writer attached, the disk work is queued on its thread.
+        """
+        self.add(entry)
+        self._persist({'op': 'add', 'entry': entry})
+
+    def commit_update(self, entry_id: str, entry: Dict[str, Any]):
+        """Replace an entry and persist the change"""
+        self.replace(entry_id, entry)
+        self._persist({'op': 'update', 'id': entry_id, 'entry': entry})
+
+    def commit_delete(self, entry_id: str) -> Dict[str, Any]:
+        """Delete an entry and persist the change"""
+        entry = self.remove(entry_id)
+        self._persist({'op': 'delete', 'id': entry_id})
+        return entry
+
+    def _persist(self, record: Dict[str, Any]):
+        """Journal one change record, or save the whole file"""
+        if not self.journal:
+            self.request_save()
+            return
+
+        if self.writer is not None:
+            self.writer.append(record)
+        else:
+            self._append_journal(record)
+        self.pending += 1
+        if self.pending >= self.compact_every:
+            self.request_save()
+
+    def request_save(self):
+        """Save now, or queue a save of the current state on the writer"""
+        if self.writer is None:
+            self.save()
+            return
+        self.pending = 0
+        self.writer.save(self.document(), set(self.all_skills))
+
+    def _append_journal(self, record: Dict[str, Any]):
+        """Append one record to the journal and fsync it"""
+        is_new = not os.path.exists(self.journal_path)
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            if is_new:
+                f.write(json.dumps({'base': self.base_hash}) + '\n')
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def save(self, file_path: Optional[str] = None):
+        """Write the whole document in one go, folding in the journal"""
+        if file_path and file_path != self.file_path:
+            self.file_path = file_path
+        self.write_document(self.content_data, self.all_skills)
+        self.pending = 0
+
+    def write_document(self, document: Dict[str, Any], skills: set):
+        """Atomically replace the file with document and drop the journal"""
+        data = serialize_content(document)
+        atomic_write(self.file_path, data)
+        self.base_hash = hashlib.sha1(data).hexdigest()
+        if self.snapshot:
+            self._write_snapshot(os.stat(self.file_path), self.base_hash, skills, document)
+        if os.path.exists(self.journal_path):
+            os.unlink(self.journal_path)
+
+    def compact(self):
+        """Fold the journal into content.json"""
+        self.save()
+
+
+class SaveWorker:
+    """Runs a ContentStore's disk writes on a dedicated thread.
+
+    Jobs are taken off a queue in order. Whenever the thread wakes up it
+    drains everything queued, and work made redundant by a later full save
+    (earlier saves, journal appends) is dropped, so a burst of edits costs
+    one write of the latest state. on_done(error, jobs) is called on the
+    worker thread after each batch; GUIs should hand it to their own
+    thread (see ContentJSONManager.post).
+    """
+
+    def __init__(self, store: ContentStore,
+                 on_done: Optional[Callable[[Optional[Exception], int], None]] = None):
+        self.store = store
+        self.on_done = on_done
+        self.queue: queue.Queue = queue.Queue()
+        self.last_error: Optional[Exception] = None
+        self.thread = threading.Thread(target=self._run, name="content-writer", daemon=True)
+        self.thread.start()
+        store.writer = self
+
+    def save(self, document: Dict[str, Any], skills: set):
+        self.queue.put(('save', (document, skills)))
+
+    def append(self, record: Dict[str, Any]):
+        self.queue.put(('append', record))
+
+    def call(self, func: Callable[[], None]):
+        """Run func on the writer thread, after everything queued before it"""
+        self.queue.put(('call', func))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is on disk"""
+        done = threading.Event()
+        self.call(done.set)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Finish all queued writes and stop; False if it timed out"""
+        self.queue.put(('stop', None))
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            return False
+        self.store.writer = None
+        return True
+
+    def _run(self):
+        while True:
+            jobs = [self.queue.get()]
+            while True:
+                try:
+                    jobs.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(kind == 'stop' for kind, _ in jobs)
+            jobs = [job for job in jobs if job[0] != 'stop']
+            received = len(jobs)
+
+            # The last save already contains every earlier save and append
+            saves = [i for i, (kind, _) in enumerate(jobs) if kind == 'save']
+            if saves:
+                jobs = [job for i, job in enumerate(jobs) if i >= saves[-1] or job[0] == 'call']
+
+            error = None
+            for kind, payload in jobs:
+                try:
+                    if kind == 'save':
+                        self.store.write_document(*payload)
+                    elif kind == 'append':
+                        self.store._append_journal(payload)
+                    else:
+                        payload()
+                except Exception as e:
+                    error = error or e
+
+            if received:
+                self.last_error = error
+                if self.on_done is not None:
+                    self.on_done(error, received)
+            if stop:
+                return
+
+
+def ingest(store: ContentStore, path: str, fmt: Optional[str] = None,
+           dry_run: bool = False, out=sys.stdout) -> Tuple[int, int]:
+    """Validate and add every record in path, then save once.
+
+    Returns (added, failed). Bad records are reported and skipped. Skills
+    are stored under their known spelling, as the form's add_skill does.
+    """
+    added = failed = 0
+    for line_no, record, error in iter_records(path, fmt):
+        if record is not None:
+            fields = normalize_record(record)
+            fields['skills'] = store.skills.resolve_all(fields['skills'])
+            is_valid, error = validate_entry(fields, store.id_index)
+            if is_valid:
+                store.add(build_entry(fields))
+                added += 1
+                continue
+        failed += 1
+        print(f"{path}:{line_no}: {error}", file=out)
+
+    if added and not dry_run:
+        store.save()
+    return added, failed
+
+# Below this many entries, spawning workers costs more than it saves
+PARALLEL_VALIDATION_MIN = 5000
+
+
+def _validate_chunk(items: List[Tuple[str, int, Any]]) -> List[Tuple[str, str]]:
+    """Check a slice of (category key, position, entry); runs in a worker"""
+    violations = []
+    for key, position, entry in items:
+        where = f"{key}[{position}]"
+        if not isinstance(entry, dict):
+            violations.append((where, "Entry must be a JSON object"))
+            continue
+        if entry.get('id'):
+            where += f" ({entry['id']})"
+        for message in entry_errors(entry, stored=True):
+            violations.append((where, message))
+        if entry.get('type') in CATEGORY_KEYS and CATEGORY_KEYS[entry['type']] != key:
+            violations.append((where, f"Type '{entry['type']}' belongs in '{CATEGORY_KEYS[entry['type']]}', not '{key}'"))
+    return violations
+
+
+def validate_content(content_data: Any, jobs: Optional[int] = None,
+                     chunk_size: int = 2000) -> List[Tuple[str, str]]:
+    """Check every entry of a loaded content.json against the add_entry rules.
+
+    Returns every (location, message) violation rather than stopping at
+    the first. Large files are split into chunks checked across worker
+    processes; duplicate ids are found in one pass over the whole file.
+    """
+    if not isinstance(content_data, dict):
+        return [("<root>", "content.json must be a JSON object")]
+
+    violations = []
+    items = []
+    for key, category in content_data.items():
+        if key not in CATEGORY_KEYS.values():
+            violations.append((key, f"Unknown category; expected one of: {', '.join(CATEGORY_KEYS.values())}"))
+            continue
+        if not isinstance(category, list):
+            violations.append((key, "Category must be a list"))
+            continue
+        items.extend((key, position, entry) for position, entry in enumerate(category))
+
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    if len(items) < PARALLEL_VALIDATION_MIN or jobs == 1:
+        for chunk in chunks:
+            violations.extend(_validate_chunk(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for chunk_violations in pool.map(_validate_chunk, chunks):
+                violations.extend(chunk_violations)
+
+    first_seen: Dict[str, str] = {}
+    for key, position, entry in items:
+        if isinstance(entry, dict) and entry.get('id'):
+            where = f"{key}[{position}]"
+            if entry['id'] in first_seen:
+                violations.append((f"{where} ({entry['id']})",
+                                   f"Duplicate id, first used at {first_seen[entry['id']]}"))
+            else:
+                first_seen[entry['id']] = where
+
+    return violations
+
+
+class SkillIndex:
+    """Precomputed, case-insensitive lookup over the skill vocabulary.
+
+    Skills are kept lowercased and sorted once, so a prefix query is a
+    bisect and a substring query is a scan with no per-item .lower().
+    When a query extends the previous one, only the previous matches are
+    re-filtered. Results are ranked (prefix matches first, then earlier
+    match position, then alphabetical) and capped at limit.
+    """
+
+    def __init__(self, values=None, limit: int = 50):
+        self.limit = limit
+        self._entries = sorted({(v.lower(), v) for v in values or []})
+        self._last_query: Optional[str] = None
+        self._last_matches: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, value: str) -> bool:
+        i = bisect.bisect_left(self._entries, (value.lower(), value))
+        return i < len(self._entries) and self._entries[i] == (value.lower(), value)
+
+    @property
+    def values(self) -> List[str]:
+        return [value for _, value in self._entries]
+
+    def add(self, value: str):
+        """Insert a value, keeping the index sorted"""
+        if value in self:
+            return
+        bisect.insort(self._entries, (value.lower(), value))
+        self._last_query = None  # positions have shifted
+
+    def prefix(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Values starting with query, alphabetical"""
+        limit = limit or self.limit
+        q = query.lower()
+        results = []
+        i = bisect.bisect_left(self._entries, (q,))
+        while i < len(self._entries) and len(results) < limit and self._entries[i][0].startswith(q):
+            results.append(self._entries[i][1])
+            i += 1
+        return results
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Top-ranked values containing query"""
+        limit = limit or self.limit
+        q = query.lower()
+        if not q:
+            return [value for _, value in self._entries[:limit]]
+
+        # Prefix hits already rank highest; stop if they fill the page
+        prefix_hits = self.prefix(q, limit)
+        if len(prefix_hits) >= limit:
+            return prefix_hits
+
+        if self._last_query is not None and q.startswith(self._last_query):
+            candidates = self._last_matches
+        else:
+            candidates = range(len(self._entries))
+        entries = self._entries
+        matches = [i for i in candidates if q in entries[i][0]]
+        self._last_query, self._last_matches = q, matches
+
+        best = heapq.nsmallest(limit, matches, key=lambda i: (entries[i][0].find(q), i))
+        return [entries[i][1] for i in best]
@@ -2,63 +2,317 @@
 """
 Content JSON Manager
 A GUI application to manage content.json entries for a personal website.
+The editor and the command line live here; the Tk-free parts they share
+are the content_*.py modules next to this file.
+
+Usage:
+    python populateContent.py [--file content.json]
+    python populateContent.py [--file content.json] ingest entries.jsonl
+    python populateContent.py [--file content.json] compact
+    python populateContent.py [--file content.json] build-index [--full]
+    python populateContent.py [--file content.json] media [--media-root public/content]
+    python populateContent.py [--file content.json] export [--out DIR]
+    python populateContent.py [--file content.json] validate
+    python populateContent.py [--file content.json] dedup [--threshold 0.5]
+    python populateContent.py [--file content.json] suggest [--max-prefix 3] [--limit 8]
+    python populateContent.py [--file content.json] build [ARTIFACT ...] [--all] [--watch]
+    python populateContent.py [--file content.json] import-db content.db
+    python populateContent.py --db content.db [--file content.json] compact
+    python populateContent.py --db content.db query [--type T] [--skill S] [--text WORDS]
+
+Add --profile (or set POPULATE_CONTENT_PROFILE=1) to any command to print
+per-operation timings on exit.
 """
 
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+try:
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog
+except ImportError:  # slim Python builds ship without Tk; only the editor needs it
+    tk = ttk = messagebox = filedialog = None
+import argparse
 import json
+import os
+import queue
+import sqlite3
+import sys
+import time
 from datetime import datetime
-import re
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
+
+from content_store import (
+    CATEGORY_KEYS, DEFAULT_CATEGORIES, ContentStore, SaveWorker, SkillIndex, atomic_write,
+    build_entry, ingest, iter_entries, slugify, validate_content,
+    validate_date_format, validate_entry
+)
+from content_sqlite import SQLiteStore
+from content_index import (
+    SHARDS_DIR, SUGGEST_LIMIT, SUGGEST_PREFIX_LENGTH, SearchIndex, build_search_index,
+    export_shards, id_index_path, search_index_path, skills_index_path, suggestions_path,
+    write_id_index, write_skills_index, write_suggestions
+)
+from content_media import Image, build_store_media
+from content_dedup import DEDUP_THRESHOLD, DuplicateIndex, duplicate_cache_path
+from content_build import BUILD_ARTIFACTS, build_outputs
+from content_profile import PROFILE_ENV, Profiler
 
-class AutocompleteCombobox(ttk.Combobox):
+class AutocompleteCombobox(ttk.Combobox if ttk is not None else object):
     """A Combobox with autocomplete functionality"""
     
-    def __init__(self, parent, values=None, **kwargs):
+    def __init__(self, parent, values=None, limit: int = 50, debounce_ms: int = 120, **kwargs):
         super().__init__(parent, **kwargs)
-        self.values_list = values or []
-        self['values'] = self.values_list
+        self.index = SkillIndex(values, limit)
+        self.debounce_ms = debounce_ms
+        self._after_id = None
+        self['values'] = self.index.search('')
         self.bind('<KeyRelease>', self.on_key_release)
         self.bind('<Button-1>', self.on_click)
     
+    @property
+    def values_list(self) -> List[str]:
+        return self.index.values
+    
     def on_key_release(self, event):
         """Handle key release events for autocomplete"""
         if event.keysym in ('Up', 'Down', 'Left', 'Right', 'Tab', 'Return'):
             return
         
+        # Debounce: only filter once typing pauses
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+        self._after_id = self.after(self.debounce_ms, self.refresh_matches)
+    
+    def refresh_matches(self):
+        """Filter values based on current input"""
+        self._after_id = None
         current_text = self.get()
-        if not current_text:
-            self['values'] = self.values_list
-            return
-        
-        # Filter values based on current input
-        matches = [item for item in self.values_list 
-                  if current_text.lower() in item.lower()]
+        matches = self.index.search(current_text)
         self['values'] = matches
         
-        if matches:
+        if current_text and matches:
             self.event_generate('<Down>')
     
     def on_click(self, event):
         """Show all values when clicked"""
-        self['values'] = self.values_list
+        self['values'] = self.index.search('')
     
     def add_value(self, value: str):
         """Add a new value to the list"""
-        if value not in self.values_list:
-            self.values_list.append(value)
-            self['values'] = self.values_list
+        self.index.add(value)
+
+UI_POLL_MS = 100
+
+
+class EntriesBrowser:
+    """Paged Treeview over every entry, with type/category/skill filters.
+
+    Rows are inserted a page at a time as the list is scrolled, and the
+    filters are answered from in-memory id sets rather than by rescanning
+    entries. Edits and deletes made through the manager update only the
+    affected row and index entries.
+    """
+
+    PAGE_SIZE = 200
+    COLUMNS = ('title', 'company', 'type', 'category', 'startDate')
+
+    def __init__(self, manager: 'ContentJSONManager'):
+        self.manager = manager
+        self.store = manager.store
+        self.rows: List[str] = []
+        self.rendered = 0
+
+        self.window = tk.Toplevel(manager.root)
+        self.window.title("Browse Entries")
+        self.window.geometry("900x600")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        frame = ttk.Frame(self.window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(1, weight=1)
+
+        self.build_indexes()
+
+        # Filters
+        filter_frame = ttk.Frame(frame)
+        filter_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        ttk.Label(filter_frame, text="Type:").grid(row=0, column=0, padx=(0, 5))
+        self.type_filter = ttk.Combobox(filter_frame, values=[''] + list(CATEGORY_KEYS), state='readonly', width=12)
+        self.type_filter.grid(row=0, column=1, padx=(0, 10))
+        self.type_filter.bind('<<ComboboxSelected>>', self.apply_filters)
+
+        ttk.Label(filter_frame, text="Category:").grid(row=0, column=2, padx=(0, 5))
+        self.category_filter = ttk.Combobox(filter_frame, values=[''] + sorted(self.by_category),
+                                            state='readonly', width=18)
+        self.category_filter.grid(row=0, column=3, padx=(0, 10))
+        self.category_filter.bind('<<ComboboxSelected>>', self.apply_filters)
+
+        ttk.Label(filter_frame, text="Skill:").grid(row=0, column=4, padx=(0, 5))
+        self.skill_filter = AutocompleteCombobox(filter_frame, values=self.store.skills.names(), width=20)
+        self.skill_filter.grid(row=0, column=5, padx=(0, 10))
+        self.skill_filter.bind('<Return>', self.apply_filters)
+        self.skill_filter.bind('<<ComboboxSelected>>', self.apply_filters)
+
+        ttk.Button(filter_frame, text="Clear Filters", command=self.clear_filters).grid(row=0, column=6)
+
+        # Entries
+        self.tree = ttk.Treeview(frame, columns=self.COLUMNS, show='tree headings', selectmode='browse')
+        self.tree.heading('#0', text="ID")
+        self.tree.column('#0', width=180)
+        for column in self.COLUMNS:
+            self.tree.heading(column, text=column[0].upper() + column[1:])
+            self.tree.column(column, width=120)
+        self.v_scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_scroll)
+        self.tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.v_scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        self.tree.bind('<Double-1>', lambda event: self.edit_selected())
+
+        # Actions
+        button_frame = ttk.Frame(frame)
+        button_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(10, 0))
+        ttk.Button(button_frame, text="Edit", command=self.edit_selected).grid(row=0, column=0, padx=(0, 5))
+        ttk.Button(button_frame, text="Delete", command=self.delete_selected).grid(row=0, column=1, padx=(0, 10))
+        self.count_var = tk.StringVar()
+        ttk.Label(button_frame, textvariable=self.count_var).grid(row=0, column=2)
+
+        self.apply_filters()
+
+    def build_indexes(self):
+        """type/category/skill -> ids, built once per window"""
+        self.by_type: Dict[str, set] = {}
+        self.by_category: Dict[str, set] = {}
+        self.by_skill: Dict[str, set] = {}
+        for entry in iter_entries(self.store.content_data):
+            self._index(entry)
+
+    def _index(self, entry: Dict[str, Any]):
+        self.by_type.setdefault(entry.get('type', ''), set()).add(entry['id'])
+        self.by_category.setdefault(entry.get('category', ''), set()).add(entry['id'])
+        for skill in entry.get('skills', []):
+            self.by_skill.setdefault(self.store.skills.canonical(skill), set()).add(entry['id'])
+
+    def _unindex(self, entry: Dict[str, Any]):
+        self.by_type.get(entry.get('type', ''), set()).discard(entry['id'])
+        self.by_category.get(entry.get('category', ''), set()).discard(entry['id'])
+        for skill in entry.get('skills', []):
+            self.by_skill.get(self.store.skills.canonical(skill), set()).discard(entry['id'])
+
+    def _values(self, entry: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(entry.get(column) or '') for column in self.COLUMNS)
+
+    def apply_filters(self, event=None):
+        """Recompute the visible ids from the filter indexes and re-page"""
+        selected = []
+        if self.type_filter.get():
+            selected.append(self.by_type.get(self.type_filter.get(), set()))
+        if self.category_filter.get():
+            selected.append(self.by_category.get(self.category_filter.get(), set()))
+        if self.skill_filter.get().strip():
+            selected.append(self.by_skill.get(self.store.skills.canonical(self.skill_filter.get()), set()))
+
+        matches = set.intersection(*selected) if selected else None
+        seen = set()
+        self.rows = []
+        for entry in iter_entries(self.store.content_data):
+            entry_id = entry['id']
+            if entry_id not in seen and (matches is None or entry_id in matches):
+                seen.add(entry_id)
+                self.rows.append(entry_id)
+
+        self.tree.delete(*self.tree.get_children())
+        self.rendered = 0
+        self.render_page()
+
+    def clear_filters(self):
+        self.type_filter.set('')
+        self.category_filter.set('')
+        self.skill_filter.set('')
+        self.apply_filters()
+
+    def render_page(self):
+        """Insert the next PAGE_SIZE rows"""
+        for entry_id in self.rows[self.rendered:self.rendered + self.PAGE_SIZE]:
+            entry = self.store.get(entry_id)
+            if entry is not None:
+                self.tree.insert('', tk.END, iid=entry_id, text=entry_id, values=self._values(entry))
+        self.rendered = min(len(self.rows), self.rendered + self.PAGE_SIZE)
+        self.update_count()
+
+    def update_count(self):
+        self.count_var.set(f"Showing {self.rendered} of {len(self.rows)} matching entries "
+                           f"({len(self.store.id_index)} total)")
+
+    def on_scroll(self, first: str, last: str):
+        """Scrollbar callback: load the next page when nearing the end"""
+        self.v_scrollbar.set(first, last)
+        if float(last) > 0.9 and self.rendered < len(self.rows):
+            self.render_page()
+
+    def selected_id(self) -> Optional[str]:
+        selection = self.tree.selection()
+        return selection[0] if selection else None
+
+    def edit_selected(self):
+        entry_id = self.selected_id()
+        if entry_id:
+            self.manager.load_entry(entry_id)
+
+    def delete_selected(self):
+        entry_id = self.selected_id()
+        if entry_id and messagebox.askyesno("Delete Entry", f"Delete '{entry_id}'?", parent=self.window):
+            self.manager.delete_entry(entry_id)
+
+    def entry_added(self, entry: Dict[str, Any]):
+        """New entries show up the next time the filters are applied"""
+        self._index(entry)
+        self.update_count()
+
+    def entry_changed(self, old_entry: Dict[str, Any], entry: Dict[str, Any]):
+        """Refresh the one row (and index entries) an edit touched"""
+        self._unindex(old_entry)
+        self._index(entry)
+        old_id = old_entry['id']
+        if old_id in self.rows:
+            self.rows[self.rows.index(old_id)] = entry['id']
+        if not self.tree.exists(old_id):
+            return
+        if entry['id'] == old_id:
+            self.tree.item(old_id, values=self._values(entry))
+        else:
+            position = self.tree.index(old_id)
+            self.tree.delete(old_id)
+            self.tree.insert('', position, iid=entry['id'], text=entry['id'], values=self._values(entry))
+
+    def entry_removed(self, entry: Dict[str, Any]):
+        """Drop the one row a delete touched"""
+        self._unindex(entry)
+        if entry['id'] in self.rows:
+            self.rows.remove(entry['id'])
+        if self.tree.exists(entry['id']):
+            self.tree.delete(entry['id'])
+            self.rendered -= 1
+        self.update_count()
+
+    def close(self):
+        self.manager.browser = None
+        self.window.destroy()
+
 
 class ContentJSONManager:
-    def __init__(self, root):
+    def __init__(self, root, store: Optional[ContentStore] = None, check_duplicates: bool = False):
         self.root = root
         self.root.title("Content JSON Manager")
         self.root.geometry("800x900")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Data storage
-        self.content_data = {"experiences": [], "projects": [], "education": [], "about": []}
-        self.all_skills = set()
-        self.file_path = "content.json"
+        self.store = store or ContentStore()
+        self.search_index: Optional[SearchIndex] = None
+        self.editing_id: Optional[str] = None
+        self.browser: Optional[EntriesBrowser] = None
+        self.check_duplicates = check_duplicates
+        self.duplicates: Optional[DuplicateIndex] = None
         
         # Load existing data
         self.load_existing_data()
@@ -66,22 +320,38 @@ class ContentJSONManager:
         # Create GUI
         self.create_widgets()
         
+        # Disk writes happen on the writer thread; results come back
+        # through ui_queue, which the Tk loop polls with after()
+        self.ui_queue: queue.Queue = queue.Queue()
+        self.writer = SaveWorker(self.store, self.on_save_done)
+        self.root.after(UI_POLL_MS, self.poll_ui_queue)
+    
+    @property
+    def file_path(self) -> str:
+        return self.store.file_path
+    
+    @file_path.setter
+    def file_path(self, value: str):
+        self.store.file_path = value
+    
+    @property
+    def content_data(self) -> Dict[str, List[Dict[str, Any]]]:
+        return self.store.content_data
+    
+    @property
+    def all_skills(self) -> set:
+        return self.store.all_skills
+        
     def load_existing_data(self):
         """Load existing content.json file if it exists"""
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                self.content_data = json.load(f)
-                
-            # Extract all existing skills for autocomplete
-            for category in self.content_data.values():
-                for item in category:
-                    if 'skills' in item:
-                        self.all_skills.update(item['skills'])
-                        
+            self.store.load()
         except FileNotFoundError:
             messagebox.showinfo("Info", f"{self.file_path} not found. Starting with empty data.")
         except json.JSONDecodeError:
             messagebox.showerror("Error", f"Invalid JSON in {self.file_path}")
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", f"Failed to open {self.store.db_path}: {e}")
     
     def create_widgets(self):
         """Create the main GUI widgets"""
@@ -201,7 +471,7 @@ class ContentJSONManager:
         skills_entry_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 5))
         skills_entry_frame.columnconfigure(0, weight=1)
         
-        self.skills_combo = AutocompleteCombobox(skills_entry_frame, values=list(self.all_skills))
+        self.skills_combo = AutocompleteCombobox(skills_entry_frame, values=self.store.skills.names())
         self.skills_combo.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 5))
         
         ttk.Button(skills_entry_frame, text="Add Skill", 
@@ -237,12 +507,45 @@ class ContentJSONManager:
         button_frame = ttk.Frame(main_frame)
         button_frame.grid(row=3, column=0, columnspan=2, pady=20)
         
-        ttk.Button(button_frame, text="Add Entry", 
-                  command=self.add_entry, style='Accent.TButton').grid(row=0, column=0, padx=5)
+        self.add_button = ttk.Button(button_frame, text="Add Entry", 
+                                     command=self.add_entry, style='Accent.TButton')
+        self.add_button.grid(row=0, column=0, padx=5)
         ttk.Button(button_frame, text="Clear Form", 
                   command=self.clear_form).grid(row=0, column=1, padx=5)
-        ttk.Button(button_frame, text="View JSON", 
-                  command=self.view_json).grid(row=0, column=2, padx=5)
+        ttk.Button(button_frame, text="Browse Entries", 
+                  command=self.open_browser).grid(row=0, column=2, padx=5)
+        
+        # Save status
+        self.status_var = tk.StringVar()
+        ttk.Label(main_frame, textvariable=self.status_var).grid(row=4, column=0, columnspan=2, sticky=tk.W)
+    
+    def post(self, func: Callable[[], None]):
+        """Run func on the Tk thread (safe to call from any thread)"""
+        self.ui_queue.put(func)
+    
+    def poll_ui_queue(self):
+        """Run callbacks posted by background threads"""
+        try:
+            while True:
+                try:
+                    func = self.ui_queue.get_nowait()
+                except queue.Empty:
+                    break
+                func()
+        finally:
+            # A failing callback must not stop the polling for good
+            self.root.after(UI_POLL_MS, self.poll_ui_queue)
+    
+    def on_save_done(self, error: Optional[Exception], jobs: int):
+        """Writer thread callback: report the result on the Tk thread"""
+        self.post(lambda: self.show_save_result(error))
+    
+    def show_save_result(self, error: Optional[Exception]):
+        if error is not None:
+            self.status_var.set(f"Save failed: {error}")
+            messagebox.showerror("Error", f"Failed to save file: {str(error)}")
+            return
+        self.status_var.set(f"Saved to {self.file_path} at {datetime.now():%H:%M:%S}")
     
     def browse_file(self):
         """Browse for JSON file"""
@@ -251,38 +554,37 @@ class ContentJSONManager:
             filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
         )
         if filename:
+            self.writer.flush()  # queued saves belong to the old file
+            if self.browser is not None:
+                self.browser.close()
+            self.clear_form()
             self.file_path_var.set(filename)
             self.file_path = filename
+            self.search_index = self.duplicates = None
             self.load_existing_data()
     
     def update_id(self, event=None):
         """Auto-generate ID based on title"""
         title = self.title_var.get().strip()
         if title and not self.id_var.get():
-            # Convert title to lowercase, replace spaces with hyphens, remove special chars
-            id_suggestion = re.sub(r'[^a-z0-9\s-]', '', title.lower())
-            id_suggestion = re.sub(r'\s+', '-', id_suggestion.strip())
-            self.id_var.set(id_suggestion)
+            self.id_var.set(slugify(title))
     
     def update_category(self, event=None):
         """Auto-update category based on type"""
-        type_mapping = {
-            'experience': 'Work Experience',
-            'project': 'Projects',
-            'education': 'Education',
-            'about': 'About'
-        }
         selected_type = self.type_var.get()
-        if selected_type in type_mapping:
-            self.category_var.set(type_mapping[selected_type])
+        if selected_type in DEFAULT_CATEGORIES:
+            self.category_var.set(DEFAULT_CATEGORIES[selected_type])
     
     def add_skill(self):
         """Add skill to the listbox"""
         skill = self.skills_combo.get().strip()
         if skill:
+            # Use the existing spelling, so "python" does not become a second "Python"
+            registry = self.store.skills
+            skill = registry.resolve(skill)
             # Check if skill already exists in listbox
-            current_skills = list(self.skills_listbox.get(0, tk.END))
-            if skill not in current_skills:
+            current_skills = {registry.canonical(s) for s in self.skills_listbox.get(0, tk.END)}
+            if registry.canonical(skill) not in current_skills:
                 self.skills_listbox.insert(tk.END, skill)
                 # Add to autocomplete list
                 self.skills_combo.add_value(skill)
@@ -301,125 +603,224 @@ class ContentJSONManager:
     
     def validate_date_format(self, date_str: str) -> bool:
         """Validate date format YYYY-MM"""
-        if not date_str:
-            return True  # Empty is allowed for optional fields
-        
-        pattern = r'^\d{4}-\d{2}$'
-        if not re.match(pattern, date_str):
-            return False
-        
-        try:
-            year, month = map(int, date_str.split('-'))
-            return 1 <= month <= 12 and 1900 <= year <= 2100
-        except ValueError:
-            return False
-    
-    def validate_form(self) -> tuple[bool, str]:
-        """Validate form data"""
-        # Required fields
-        if not self.id_var.get().strip():
-            return False, "ID is required"
-        if not self.title_var.get().strip():
-            return False, "Title is required"
-        if not self.company_var.get().strip():
-            return False, "Company is required"
-        if not self.type_var.get():
-            return False, "Type is required"
-        if not self.category_var.get().strip():
-            return False, "Category is required"
-        if not self.start_date_var.get().strip():
-            return False, "Start Date is required"
-        if not self.detail_text.get(1.0, tk.END).strip():
-            return False, "Detail is required"
-        if self.skills_listbox.size() == 0:
-            return False, "At least one skill is required"
-        
-        # Date validation
-        if not self.validate_date_format(self.start_date_var.get()):
-            return False, "Start Date must be in format YYYY-MM"
-        
-        end_date = self.end_date_var.get().strip()
-        if end_date and not self.validate_date_format(end_date):
-            return False, "End Date must be in format YYYY-MM"
-        
-        # Relevance validation
-        relevance = self.relevance_var.get().strip()
-        if relevance:
-            try:
-                rel_int = int(relevance)
-                if not 1 <= rel_int <= 5:
-                    return False, "Relevance must be between 1 and 5"
-            except ValueError:
-                return False, "Relevance must be a number"
-        
-        return True, ""
+        return validate_date_format(date_str)
+    
+    def form_fields(self) -> Dict[str, Any]:
+        """Collect the raw form values as entry fields.
+
+        An entry stored without a start date (the About entries) keeps its
+        null startDate while the field is left empty.
+        """
+        start_date = self.start_date_var.get()
+        if self.editing_id is not None and not start_date.strip():
+            if self.store.get(self.editing_id).get('startDate', '') is None:
+                start_date = None
+        return {
+            "id": self.id_var.get(),
+            "title": self.title_var.get(),
+            "company": self.company_var.get(),
+            "type": self.type_var.get(),
+            "category": self.category_var.get(),
+            "startDate": start_date,
+            "endDate": self.end_date_var.get(),
+            "dateRange": self.date_range_var.get(),
+            "relevance": self.relevance_var.get(),
+            "detail": self.detail_text.get(1.0, tk.END),
+            "skills": list(self.skills_listbox.get(0, tk.END)),
+            "link": {
+                "url": self.link_url_var.get(),
+                "label": self.link_label_var.get()
+            }
+        }
+    
+    def validate_form(self, fields: Optional[Dict[str, Any]] = None) -> tuple[bool, str]:
+        """Validate form data (fields as returned by form_fields, read if not given)"""
+        if fields is None:
+            fields = self.form_fields()
+        return validate_entry(fields, self.store.id_index, self.editing_id, null_start=True)
     
     def add_entry(self):
-        """Add the entry to JSON data"""
+        """Add the entry to JSON data (or save the entry being edited)"""
         # Validate form
-        is_valid, error_msg = self.validate_form()
+        fields = self.form_fields()
+        is_valid, error_msg = self.validate_form(fields)
         if not is_valid:
             messagebox.showerror("Validation Error", error_msg)
             return
         
+        if self.editing_id is not None:
+            self.save_edited_entry(fields)
+            return
+        
         # Build entry data
-        entry = {
-            "id": self.id_var.get().strip(),
-            "title": self.title_var.get().strip(),
-            "company": self.company_var.get().strip(),
-            "startDate": self.start_date_var.get().strip(),
-            "detail": self.detail_text.get(1.0, tk.END).strip().replace('\n', '\\n'),
-            "skills": list(self.skills_listbox.get(0, tk.END)),
-            "type": self.type_var.get(),
-            "category": self.category_var.get().strip()
-        }
+        fields["detail"] = fields["detail"].strip().replace('\n', '\\n')
+        entry = build_entry(fields)
+        if self.check_duplicates and not self.confirm_not_duplicate(entry):
+            return
         
-        # Add optional fields
-        end_date = self.end_date_var.get().strip()
-        if end_date:
-            entry["endDate"] = end_date
-        
-        date_range = self.date_range_var.get().strip()
-        if date_range:
-            entry["dateRange"] = date_range
-        
-        relevance = self.relevance_var.get().strip()
-        if relevance:
-            entry["relevance"] = int(relevance)
-        
-        # Add link if provided
-        link_url = self.link_url_var.get().strip()
-        link_label = self.link_label_var.get().strip()
-        if link_url and link_label:
-            entry["link"] = {
-                "url": link_url,
-                "label": link_label
-            }
+        # Save to file (on the writer thread)
+        if self.file_path_var.get() != self.file_path:
+            self.writer.flush()  # queued saves belong to the old file
+            self.store.add(entry)
+            self.file_path = self.file_path_var.get()
+            self.store.request_save()
+        else:
+            self.store.commit(entry)
         
-        # Add to appropriate category
-        entry_type = self.type_var.get()
-        if entry_type == 'experience':
-            self.content_data['experiences'].append(entry)
-        elif entry_type == 'project':
-            self.content_data['projects'].append(entry)
-        elif entry_type == 'education':
-            self.content_data['education'].append(entry)
-        elif entry_type == 'about':
-            self.content_data['about'].append(entry)
-        
-        # Save to file
-        try:
-            with open(self.file_path_var.get(), 'w', encoding='utf-8') as f:
-                json.dump(self.content_data, f, indent=2, ensure_ascii=False)
-            
-            messagebox.showinfo("Success", f"Entry added successfully to {self.file_path_var.get()}")
+        self.update_indexes(entry)
+        self.update_duplicates(entry['id'], entry)
+        if self.browser is not None:
+            self.browser.entry_added(entry)
+        self.status_var.set(f"Added '{entry['id']}', saving...")
+        self.clear_form()
+    
+    def save_edited_entry(self, fields: Dict[str, Any]):
+        """Replace the entry being edited with the form contents"""
+        # Edits keep detail text as-is so existing line breaks survive
+        fields["detail"] = fields["detail"].strip()
+        entry = build_entry(fields)
+        old_id = self.editing_id
+        old_entry = self.store.get(old_id)
+        # Keep fields the form does not edit (photos, video, media metadata)
+        for key, value in old_entry.items():
+            if key not in entry and key not in ('endDate', 'dateRange', 'relevance', 'link'):
+                entry[key] = value
+        
+        self.store.commit_update(old_id, entry)
+        self.update_indexes()
+        self.update_duplicates(old_id, entry)
+        if self.browser is not None:
+            self.browser.entry_changed(old_entry, entry)
+        self.status_var.set(f"Updated '{entry['id']}', saving...")
+        self.clear_form()
+    
+    def delete_entry(self, entry_id: str):
+        """Delete one entry and persist the change"""
+        entry = self.store.commit_delete(entry_id)
+        self.update_indexes()
+        self.update_duplicates(entry_id)
+        if self.browser is not None:
+            self.browser.entry_removed(entry)
+        if self.editing_id == entry_id:
             self.clear_form()
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save file: {str(e)}")
+        self.status_var.set(f"Deleted '{entry_id}', saving...")
+    
+    def load_entry(self, entry_id: str):
+        """Open an existing entry in the form for editing"""
+        entry = self.store.get(entry_id)
+        if entry is None:
+            return
+        self.clear_form()
+        self.editing_id = entry_id
+        self.id_var.set(entry.get('id', ''))
+        self.title_var.set(entry.get('title', ''))
+        self.company_var.set(entry.get('company', ''))
+        self.type_var.set(entry.get('type', ''))
+        self.category_var.set(entry.get('category', ''))
+        self.start_date_var.set(entry.get('startDate') or '')
+        self.end_date_var.set(entry.get('endDate') or '')
+        self.date_range_var.set(entry.get('dateRange', ''))
+        self.relevance_var.set(str(entry.get('relevance', '')))
+        self.detail_text.insert(1.0, entry.get('detail', ''))
+        for skill in entry.get('skills', []):
+            self.skills_listbox.insert(tk.END, skill)
+        link = entry.get('link') or {}
+        self.link_url_var.set(link.get('url', ''))
+        self.link_label_var.set(link.get('label', ''))
+        self.add_button.configure(text="Save Changes")
+        self.status_var.set(f"Editing '{entry_id}' (Clear Form to cancel)")
+        self.root.lift()
+    
+    def open_browser(self):
+        """Open (or raise) the entries browser"""
+        if self.browser is not None:
+            self.browser.window.lift()
+            return
+        self.browser = EntriesBrowser(self)
+    
+    def update_indexes(self, entry: Optional[Dict[str, Any]] = None):
+        """Refresh the search, id and skills indexes and suggestions, if the site uses them.
+
+        A newly added entry is indexed on its own; without one (edits and
+        deletes) the search index is synced, which still only touches the
+        postings of entries whose content changed. Runs on the writer
+        thread against a copy of the current state.
+        """
+        file_path = self.file_path
+        document = self.store.document()
+        id_index = dict(self.store.id_index)
+        skills_path = skills_index_path(file_path)
+        suggest = os.path.exists(suggestions_path(file_path))
+        skills_json = None
+        if suggest or os.path.exists(skills_path):
+            skills_json = self.store.skills.to_json(self.store.get)
+        
+        def update():
+            path = search_index_path(file_path)
+            try:
+                if os.path.exists(path):
+                    if self.search_index is None:
+                        self.search_index, _ = build_search_index(document, path)
+                    else:
+                        if entry is not None:
+                            self.search_index.add(entry)
+                        else:
+                            self.search_index.sync(document)
+                        self.search_index.save(path)
+                
+                path = id_index_path(file_path)
+                if os.path.exists(path):
+                    write_id_index(id_index, path)
+                
+                path = skills_path
+                if skills_json is not None and os.path.exists(path):
+                    write_skills_index(skills_json, path)
+                
+                path = suggestions_path(file_path)
+                if suggest:
+                    write_suggestions(file_path, document, skills_json)
+            except OSError as e:
+                message = f"Entry saved, but failed to update {path}: {e}"
+                self.post(lambda: messagebox.showwarning("Warning", message))
+        
+        self.writer.call(update)
+    
+    def confirm_not_duplicate(self, entry: Dict[str, Any]) -> bool:
+        """Ask before adding an entry whose text reads like an existing one"""
+        if self.duplicates is None:
+            self.duplicates = DuplicateIndex.build(self.store.content_data, duplicate_cache_path(self.file_path))
+        matches = self.duplicates.similar(entry)
+        if not matches:
+            return True
+        
+        lines = '\n'.join(f"  {entry_id} ({similarity:.0%} similar)" for similarity, entry_id in matches[:5])
+        return messagebox.askyesno("Possible Duplicate",
+                                   f"This entry looks like:\n{lines}\n\nAdd it anyway?")
+    
+    def update_duplicates(self, entry_id: str, entry: Optional[Dict[str, Any]] = None):
+        """Keep the duplicate index (and its signature cache) in step with an add, edit or delete"""
+        if self.duplicates is None:
+            return
+        self.duplicates.remove(entry_id)
+        if entry is not None:
+            self.duplicates.add(entry)
+        
+        data = self.duplicates.dumps()
+        path = duplicate_cache_path(self.file_path)
+        
+        def write():
+            try:
+                atomic_write(path, data)
+            except OSError:
+                pass  # only a cache
+        
+        self.writer.call(write)
     
     def clear_form(self):
         """Clear all form fields"""
+        if self.editing_id is not None:
+            self.editing_id = None
+            self.add_button.configure(text="Add Entry")
         self.id_var.set('')
         self.title_var.set('')
         self.company_var.set('')
@@ -435,39 +836,397 @@ class ContentJSONManager:
         self.link_url_var.set('')
         self.link_label_var.set('')
     
-    def view_json(self):
-        """View current JSON data in a new window"""
-        json_window = tk.Toplevel(self.root)
-        json_window.title("Current JSON Data")
-        json_window.geometry("800x600")
-        
-        # Create text widget with scrollbars
-        frame = ttk.Frame(json_window, padding="10")
-        frame.pack(fill=tk.BOTH, expand=True)
-        
-        text_widget = tk.Text(frame, wrap=tk.NONE)
-        v_scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=text_widget.yview)
-        h_scrollbar = ttk.Scrollbar(frame, orient=tk.HORIZONTAL, command=text_widget.xview)
-        
-        text_widget.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
-        
-        text_widget.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        v_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        h_scrollbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
-        
-        frame.columnconfigure(0, weight=1)
-        frame.rowconfigure(0, weight=1)
-        
-        # Insert JSON data
-        json_str = json.dumps(self.content_data, indent=2, ensure_ascii=False)
-        text_widget.insert(1.0, json_str)
-        text_widget.configure(state='disabled')
+    def on_close(self):
+        """Flush queued writes (folding in any journal) before exiting"""
+        if self.store.pending:
+            self.store.request_save()
+        self.writer.close()
+        if self.writer.last_error is not None:
+            if not messagebox.askyesno("Error", f"Failed to save {self.file_path}: {self.writer.last_error}\n\n"
+                                       "Journaled entries are kept in the journal. Quit anyway?"):
+                self.writer = SaveWorker(self.store, self.on_save_done)
+                return
+        self.root.destroy()
 
-def main():
-    """Main function to run the application"""
+def open_store(args, journal: Optional[bool] = None) -> ContentStore:
+    """The store the global options ask for: SQLite with --db, else content.json"""
+    if args.db:
+        return SQLiteStore(args.file, args.db, compact_every=args.compact_every)
+    return ContentStore(args.file, journal=args.journal if journal is None else journal,
+                        compact_every=args.compact_every, snapshot=args.snapshot)
+
+def run_gui(store: ContentStore, check_duplicates: bool = False) -> int:
+    """Start the Tk editor"""
+    if tk is None:
+        print("The editor requires Tk (tkinter); the commands work without it", file=sys.stderr)
+        return 1
     root = tk.Tk()
-    app = ContentJSONManager(root)
+    app = ContentJSONManager(root, store, check_duplicates)
     root.mainloop()
+    return 0
+
+def run_ingest(args) -> int:
+    """Headless bulk import; never touches Tk"""
+    store = open_store(args)
+    try:
+        store.load()
+    except FileNotFoundError:
+        print(f"{args.file} not found. Starting with empty data.")
+    except json.JSONDecodeError as e:
+        print(f"Invalid JSON in {args.file}: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        added, failed = ingest(store, args.input, args.format, args.dry_run, out=sys.stderr)
+    except OSError as e:
+        print(f"Failed to read {args.input}: {e}", file=sys.stderr)
+        return 1
+
+    action = "Validated" if args.dry_run else "Added"
+    print(f"{action} {added} entries ({failed} rejected) -> {args.file}")
+
+    index_path = search_index_path(args.file)
+    if added and not args.dry_run and os.path.exists(index_path):
+        build_search_index(store.content_data, index_path)
+        print(f"Updated {index_path}")
+    index_path = id_index_path(args.file)
+    if added and not args.dry_run and os.path.exists(index_path):
+        write_id_index(store.id_index, index_path)
+        print(f"Updated {index_path}")
+    index_path = skills_index_path(args.file)
+    if added and not args.dry_run and os.path.exists(index_path):
+        write_skills_index(store.skills.to_json(store.get), index_path)
+        print(f"Updated {index_path}")
+    index_path = suggestions_path(args.file)
+    if added and not args.dry_run and os.path.exists(index_path):
+        write_suggestions(args.file, store.content_data, store.skills.to_json(store.get))
+        print(f"Updated {index_path}")
+    return 1 if failed else 0
+
+def run_compact(args) -> int:
+    """Replay <file>.journal (or export --db) and rewrite content.json atomically"""
+    store = open_store(args, journal=True)
+    try:
+        store.load()
+        pending = store.pending
+        store.compact()
+    except (OSError, json.JSONDecodeError, sqlite3.Error) as e:
+        print(f"Failed to compact {args.file}: {e}", file=sys.stderr)
+        return 1
+    if args.db:
+        print(f"Exported {len(store.id_index)} entries from {args.db} to {args.file}")
+    else:
+        print(f"Compacted {pending} journaled entries into {args.file}")
+    return 0
+
+def run_build_index(args) -> int:
+    """Build search-index.json (incrementally), id-index.json and skills-index.json"""
+    store = open_store(args)
+    try:
+        store.load()
+    except (OSError, json.JSONDecodeError, sqlite3.Error) as e:
+        print(f"Failed to load {args.file}: {e}", file=sys.stderr)
+        return 1
+
+    index_path = search_index_path(args.file)
+    if args.full and os.path.exists(index_path):
+        os.unlink(index_path)
+    index, indexed = build_search_index(store.content_data, index_path)
+    print(f"Indexed {indexed} entries ({len(index.postings)} terms) -> {index_path}")
+
+    index_path = id_index_path(args.file)
+    write_id_index(store.id_index, index_path)
+    print(f"Wrote {len(store.id_index)} ids -> {index_path}")
+
+    index_path = skills_index_path(args.file)
+    write_skills_index(store.skills.to_json(store.get), index_path)
+    print(f"Wrote {len(store.skills.entries)} skills -> {index_path}")
+    return 0
+
+def run_media(args) -> int:
+    """Build responsive photo variants and video posters, then save the metadata"""
+    if Image is None:
+        print("The media command requires Pillow (pip install Pillow)", file=sys.stderr)
+        return 1
+
+    store = open_store(args)
+    try:
+        store.load()
+    except (OSError, json.JSONDecodeError, sqlite3.Error) as e:
+        print(f"Failed to load {args.file}: {e}", file=sys.stderr)
+        return 1
+
+    processed, skipped, failed, changed = build_store_media(store, store.content_data, args.media_root,
+                                                            args.jobs, out=sys.stderr)
+    if changed:
+        store.save()
+    print(f"Processed {processed} media files ({skipped} unchanged, {failed} failed)")
+    return 1 if failed else 0
+
+def run_export(args) -> int:
+    """Write the sharded export (manifest + chunks) next to content.json"""
+    store = open_store(args)
+    try:
+        store.load()
+    except (OSError, json.JSONDecodeError, sqlite3.Error) as e:
+        print(f"Failed to load {args.file}: {e}", file=sys.stderr)
+        return 1
+
+    out_dir = args.out or os.path.join(os.path.dirname(args.file), SHARDS_DIR)
+    written, unchanged, removed = export_shards(store.content_data, out_dir)
+    print(f"Exported to {out_dir}: {written} chunks written, {unchanged} unchanged, {removed} removed")
+    return 0
+
+def run_validate(args) -> int:
+    """Check the whole file and report every violation; non-zero exit on failure"""
+    try:
+        if args.db:
+            store = open_store(args)
+            store.load()
+            content_data = store.content_data
+        else:
+            with open(args.file, 'r', encoding='utf-8') as f:
+                content_data = json.load(f)
+    except (OSError, json.JSONDecodeError, sqlite3.Error) as e:
+        print(f"Failed to load {args.db or args.file}: {e}", file=sys.stderr)
+        return 1
+
+    violations = validate_content(content_data, args.jobs)
+    for where, message in violations:
+        print(f"{args.file}: {where}: {message}")
+    entries = sum(len(c) for c in content_data.values() if isinstance(c, list)) if isinstance(content_data, dict) else 0
+    print(f"Checked {entries} entries: {len(violations)} problems", file=sys.stderr)
+    return 1 if violations else 0
+
+def run_dedup(args) -> int:
+    """Report likely duplicate entries; non-zero exit when any are found"""
+    store = open_store(args)
+    try:
+        store.load()
+    except (OSError, json.JSONDecodeError, sqlite3.Error) as e:
+        print(f"Failed to load {args.file}: {e}", file=sys.stderr)
+        return 1
+
+    cache_path = duplicate_cache_path(args.file)
+    index = DuplicateIndex.build(store.content_data, cache_path)
+    try:
+        atomic_write(cache_path, index.dumps())
+    except OSError as e:
+        print(f"Could not cache signatures in {cache_path}: {e}", file=sys.stderr)
+
+    pairs = index.pairs(args.threshold)
+    for similarity, a, b in pairs:
+        print(f"{similarity:.0%}  {a}  ~  {b}")
+    print(f"Checked {len(index.signatures)} entries: {len(pairs)} likely duplicates", file=sys.stderr)
+    return 1 if pairs else 0
+
+def run_suggest(args) -> int:
+    """Write suggestions.json: ranked suggestions for every short query"""
+    store = open_store(args)
+    try:
+        store.load()
+    except (OSError, json.JSONDecodeError, sqlite3.Error) as e:
+        print(f"Failed to load {args.file}: {e}", file=sys.stderr)
+        return 1
+
+    table = write_suggestions(args.file, store.content_data, store.skills.to_json(store.get),
+                              args.max_prefix, args.limit)
+    print(f"Wrote {len(table['content'])} content and {len(table['skills'])} skill queries"
+          f" -> {suggestions_path(args.file)}")
+    return 0
+
+def build_once(args, targets: Optional[List[str]]) -> int:
+    """Load the store and run one incremental build"""
+    store = open_store(args)
+    try:
+        store.load()
+    except (OSError, json.JSONDecodeError, sqlite3.Error) as e:
+        print(f"Failed to load {args.file}: {e}", file=sys.stderr)
+        return 1
+    _, failed = build_outputs(store, targets, args.media_root, args.jobs)
+    return 1 if failed else 0
+
+def watch_signature(args) -> List[Optional[Tuple[int, int]]]:
+    """(mtime, size) of every file an external edit would change"""
+    paths = [args.file, args.file + '.journal']
+    if args.db:
+        paths += [args.db, args.db + '-wal']
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return signature
+
+def run_build(args) -> int:
+    """Rebuild the artifacts affected by changes since the last build; --watch keeps doing so"""
+    unknown = set(args.artifacts) - set(BUILD_ARTIFACTS) - {'media'}
+    if unknown:
+        print(f"Unknown artifact(s): {', '.join(sorted(unknown))} "
+              f"(choose from {', '.join(BUILD_ARTIFACTS)}, media)", file=sys.stderr)
+        return 1
+    targets = args.artifacts or (list(BUILD_ARTIFACTS) if args.all else None)
+    if not args.watch:
+        return build_once(args, targets)
+
+    print(f"Watching {args.file} for changes (Ctrl+C to stop)", file=sys.stderr)
+    last = None
+    try:
+        while True:
+            if watch_signature(args) != last:
+                build_once(args, targets)
+                # Taken after the build, so its own content.json export does not retrigger it
+                last = watch_signature(args)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+
+def run_import_db(args) -> int:
+    """Copy content.json into a SQLite database for use with --db"""
+    try:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            content_data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Failed to load {args.file}: {e}", file=sys.stderr)
+        return 1
+
+    store = SQLiteStore(args.file, args.database)
+    try:
+        imported = store.import_document(content_data, replace=args.replace)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"Failed to import into {args.database}: {e}", file=sys.stderr)
+        return 1
+    print(f"Imported {imported} entries -> {args.database}")
+    return 0
+
+def run_query(args) -> int:
+    """List entries of the --db database by type, skill and/or text"""
+    if not args.db:
+        print("The query command needs --db", file=sys.stderr)
+        return 1
+    store = open_store(args)
+    if not os.path.exists(args.db):
+        print(f"{args.db} not found", file=sys.stderr)
+        return 1
+    for entry in store.query(args.type, args.skill, args.text):
+        print(f"{entry['id']}\t{entry.get('type', '')}\t{entry.get('title', '')}")
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function to run the application"""
+    parser = argparse.ArgumentParser(description="Manage content.json entries")
+    parser.add_argument('--file', default='content.json', help="content.json to edit")
+    parser.add_argument('--journal', action='store_true',
+                        help="append new entries to <file>.journal and compact periodically")
+    parser.add_argument('--compact-every', type=int, default=50,
+                        help="journal entries (or --db changes) between content.json rewrites (default: 50)")
+    parser.add_argument('--no-snapshot', dest='snapshot', action='store_false',
+                        help="always parse content.json instead of using .<file>.snapshot")
+    parser.add_argument('--db', metavar='DATABASE',
+                        help="keep entries in this SQLite database; --file becomes its content.json export")
+    parser.add_argument('--check-duplicates', action='store_true',
+                        help="in the editor, ask before adding an entry that reads like an existing one")
+    parser.add_argument('--profile', action='store_true',
+                        help=f"time the main operations and print a summary on exit (or set {PROFILE_ENV}=1)")
+    parser.add_argument('--profile-cpu', metavar='FILE', help="also write cProfile stats to FILE")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="also report peak memory and top allocations (tracemalloc)")
+    subparsers = parser.add_subparsers(dest='command')
+
+    ingest_parser = subparsers.add_parser('ingest', help="bulk-add entries from JSONL or CSV")
+    ingest_parser.add_argument('input', help="entries file (.jsonl or .csv)")
+    ingest_parser.add_argument('--format', choices=['jsonl', 'csv'],
+                               help="input format (default: from file extension)")
+    ingest_parser.add_argument('--dry-run', action='store_true',
+                               help="validate only, do not write")
+
+    subparsers.add_parser('compact', help="fold the journal into content.json")
+
+    index_parser = subparsers.add_parser('build-index', help="write search, id and skills indexes next to content.json")
+    index_parser.add_argument('--full', action='store_true', help="rebuild from scratch")
+
+    media_parser = subparsers.add_parser('media', help="build photo variants/video posters and store their sizes")
+    media_parser.add_argument('--media-root', default=os.path.join('public', 'content'),
+                              help="directory the site serves /content/ from (default: public/content)")
+    media_parser.add_argument('--jobs', type=int, help="worker processes (default: CPU count)")
+
+    export_parser = subparsers.add_parser('export', help="write a summary manifest plus per-category/per-entry chunks")
+    export_parser.add_argument('--out', help=f"output directory (default: {SHARDS_DIR}/ next to content.json)")
+
+    validate_parser = subparsers.add_parser('validate', help="check every entry in the file (pre-deploy gate)")
+    validate_parser.add_argument('--jobs', type=int, help="worker processes for large files (default: CPU count)")
+
+    dedup_parser = subparsers.add_parser('dedup', help="find near-duplicate entries by title and detail text")
+    dedup_parser.add_argument('--threshold', type=float, default=DEDUP_THRESHOLD,
+                              help="estimated similarity to report, 0-1 (default: %(default)s)")
+
+    suggest_parser = subparsers.add_parser('suggest', help="precompute search-box suggestions for short queries")
+    suggest_parser.add_argument('--max-prefix', type=int, default=SUGGEST_PREFIX_LENGTH,
+                                help="longest query to precompute (default: %(default)s)")
+    suggest_parser.add_argument('--limit', type=int, default=SUGGEST_LIMIT,
+                                help="suggestions per query and kind (default: %(default)s)")
+
+    build_parser = subparsers.add_parser('build', help="rebuild only the derived files affected since the last build")
+    build_parser.add_argument('artifacts', nargs='*', metavar='ARTIFACT',
+                              help=f"what to build: {', '.join(BUILD_ARTIFACTS)}, media "
+                                   "(default: whatever already exists)")
+    build_parser.add_argument('--all', action='store_true', help="build every artifact except media")
+    build_parser.add_argument('--media-root', default=os.path.join('public', 'content'),
+                              help="directory the site serves /content/ from (default: public/content)")
+    build_parser.add_argument('--jobs', type=int, help="worker processes (default: CPU count)")
+    build_parser.add_argument('--watch', action='store_true', help="rebuild whenever content.json changes")
+    build_parser.add_argument('--interval', type=float, default=1.0,
+                              help="seconds between checks in --watch mode (default: %(default)s)")
+
+    import_parser = subparsers.add_parser('import-db', help="copy content.json into a new SQLite database")
+    import_parser.add_argument('database', help="SQLite file to create or fill")
+    import_parser.add_argument('--replace', action='store_true', help="overwrite entries already in the database")
+
+    query_parser = subparsers.add_parser('query', help="list entries in the --db database")
+    query_parser.add_argument('--type', choices=list(CATEGORY_KEYS), help="entry type")
+    query_parser.add_argument('--skill', help="skill (case-insensitive)")
+    query_parser.add_argument('--text', help="words in the title or detail (full-text search)")
+
+    args = parser.parse_args(argv)
+    if not (args.profile or args.profile_cpu or args.profile_memory
+            or os.environ.get(PROFILE_ENV, '') not in ('', '0')):
+        return run_command(args)
+
+    profiler = Profiler(args.profile_cpu, args.profile_memory)
+    profiler.start(globals())
+    try:
+        return run_command(args)
+    finally:
+        profiler.report(sys.stderr)
+
+def run_command(args) -> int:
+    """Dispatch the parsed command line"""
+    if args.command == 'ingest':
+        return run_ingest(args)
+    if args.command == 'compact':
+        return run_compact(args)
+    if args.command == 'build-index':
+        return run_build_index(args)
+    if args.command == 'media':
+        return run_media(args)
+    if args.command == 'export':
+        return run_export(args)
+    if args.command == 'validate':
+        return run_validate(args)
+    if args.command == 'dedup':
+        return run_dedup(args)
+    if args.command == 'suggest':
+        return run_suggest(args)
+    if args.command == 'build':
+        return run_build(args)
+    if args.command == 'import-db':
+        return run_import_db(args)
+    if args.command == 'query':
+        return run_query(args)
+
+    return run_gui(open_store(args), args.check_duplicates)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -16,6 +16,7 @@ export interface ContentItem {
   category: string;
   photos?: PhotoGalleryItem[];
   video?: string; // filename in public/content/videos/
+  videoMeta?: MediaMeta & { poster: string }; // written by populateContent.py media
 }
 
 export interface ContentData {
@@ -27,7 +28,37 @@ export interface ContentData {
 
 export type ContentType = 'experiences' | 'projects' | 'education' | 'about';
 
-interface PhotoGalleryItem {
+// Written by `populateContent.py media`; paths are relative to the entry's directory
+interface MediaMeta {
+  width: number;
+  height: number;
+  size: number; // bytes
+}
+
+interface PhotoGalleryItem extends Partial<MediaMeta> {
   caption: string;
   filename: string; // just the filename, directory will be inferred
-}
\ No newline at end of file
+  variants?: { width: number; filename: string }[];
+}
+
+// Written next to content.json by `populateContent.py build-index`; keys are case-folded skills
+export interface SkillsIndex {
+  skills: Record<string, {
+    name: string;      // display spelling
+    count: number;
+    entries: string[]; // ids, sorted like getContentBySkill
+  }>;
+  aliases: Record<string, string>;
+  top: string[]; // keys, most used first
+}
+
+// Written next to content.json by `populateContent.py suggest`; keys are lowercased queries
+export interface SuggestionTable {
+  version: number;
+  maxPrefix: number; // longer queries are not in the table
+  limit: number;
+  entries: Record<string, { title: string; subtitle: string; relevance?: number }>;
+  content: Record<string, string[]>; // query -> ids, ranked like the search boxes
+  skills: Record<string, string[]>;  // query -> skill names (queries of 2+ characters)
+  skillResults: Record<string, { name: string; count: number; top: string[] }>;
+}
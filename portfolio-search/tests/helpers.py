@@ -0,0 +1,17 @@
+import content_store as cs
+
+
+def make_entry(entry_id, title="Project", entry_type="project", **fields):
+    """A valid entry; fields override or add keys"""
+    entry = {
+        "id": entry_id,
+        "title": title,
+        "company": "Acme",
+        "startDate": "2024-01",
+        "detail": f"{title} detail",
+        "skills": ["Python"],
+        "type": entry_type,
+        "category": cs.DEFAULT_CATEGORIES[entry_type]
+    }
+    entry.update(fields)
+    return entry
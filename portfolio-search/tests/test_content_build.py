@@ -0,0 +1,89 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import content_build
+import content_store as cs
+from content_build import build_outputs, build_state_path
+from helpers import make_entry
+
+
+class BuildOutputsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.file_path = os.path.join(self.tmp.name, "content.json")
+        self.media_root = os.path.join(self.tmp.name, "media")  # no media cache: media is never auto-built
+        document = cs.empty_content()
+        document["projects"] = [make_entry(f"e{i}", title=f"Entry {i}") for i in range(3)]
+        cs.atomic_write(self.file_path, cs.serialize_content(document))
+        self.store = cs.ContentStore(self.file_path, snapshot=False)
+        self.store.load()
+
+    def build(self, targets=None):
+        self.out = io.StringIO()
+        return build_outputs(self.store, targets, media_root=self.media_root, jobs=1, out=self.out)
+
+    def state(self):
+        with open(build_state_path(self.file_path), encoding="utf-8") as f:
+            return json.load(f)
+
+    def edit(self, entry_id, **fields):
+        self.store.replace(entry_id, dict(self.store.get(entry_id), **fields))
+
+    def test_second_build_is_up_to_date(self):
+        self.assertEqual(self.build(["search-index", "shards"]), (2, 0))
+        state = self.state()
+        self.assertEqual(set(state["artifacts"]), {"search-index", "shards"})
+        self.assertEqual(state["pending"], {})
+        self.assertEqual(set(state["entries"]), {"e0", "e1", "e2"})
+
+        self.assertEqual(self.build(), (0, 0))
+        self.assertIn("Up to date (0 entries changed)", self.out.getvalue())
+
+    def test_only_artifacts_reading_the_changed_field_rebuild(self):
+        self.build(["search-index", "id-index", "shards"])
+        self.edit("e1", startDate="2020-05")  # not a search field
+
+        self.assertEqual(self.build(), (1, 0))
+        self.assertEqual(self.out.getvalue().split(":")[0], "shards")
+
+    def test_missing_output_is_rebuilt(self):
+        self.build(["id-index"])
+        os.unlink(os.path.join(self.tmp.name, "id-index.json"))
+
+        self.assertEqual(self.build(["id-index"]), (1, 0))
+
+    def test_skipped_artifact_gets_every_change_since_its_build(self):
+        self.build(["search-index", "shards"])
+        self.edit("e1", title="First edit")
+        self.build(["search-index"])
+        self.assertEqual(self.state()["pending"], {"shards": ["e1"]})
+
+        self.edit("e2", title="Second edit")
+        with mock.patch.object(content_build, "export_shards", wraps=content_build.export_shards) as export:
+            self.assertEqual(self.build(["shards"]), (1, 0))
+        self.assertEqual(export.call_args.args[2], {"e1", "e2"})
+        self.assertEqual(self.state()["pending"], {"search-index": ["e2"]})
+
+    def test_failed_artifact_keeps_its_digest_and_pending_ids(self):
+        self.build(["search-index", "shards"])
+        digest = self.state()["artifacts"]["shards"]
+        self.edit("e0", title="Edited")
+
+        with mock.patch.object(content_build, "export_shards", side_effect=OSError("disk full")):
+            self.assertEqual(self.build(), (1, 1))
+        state = self.state()
+        self.assertEqual(state["artifacts"]["shards"], digest)
+        self.assertEqual(state["pending"], {"shards": ["e0"]})
+        self.assertIn("shards: failed: disk full", self.out.getvalue())
+
+        self.assertEqual(self.build(), (1, 0))
+        self.assertEqual(self.state()["pending"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import json
+import os
+import tempfile
+import unittest
+
+import content_store as cs
+from content_index import SearchIndex, export_shards
+from helpers import make_entry
+
+
+def document(entries):
+    content = cs.empty_content()
+    content["projects"] = entries
+    return content
+
+
+def by_id(index):
+    """Postings keyed by entry id, so indexes with different doc numbers compare"""
+    return {term: {index.docs[doc]: mask for doc, mask in postings.items()}
+            for term, postings in index.postings.items()}
+
+
+class SearchIndexSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.entries = [make_entry(f"e{i}", title=f"Entry {i}", skills=["Python", f"Skill{i}"])
+                        for i in range(10)]
+        self.index = SearchIndex.from_content(document(self.entries))
+
+    def assert_matches_rebuild(self, content):
+        self.assertEqual(by_id(self.index), by_id(SearchIndex.from_content(content)))
+
+    def test_unchanged_content_touches_nothing(self):
+        self.assertEqual(self.index.sync(document(self.entries)), 0)
+
+    def test_edit_reindexes_only_that_entry(self):
+        self.entries[3] = make_entry("e3", title="Renamed", skills=["Rust"])
+        content = document(self.entries)
+
+        self.assertEqual(self.index.sync(content), 1)
+        self.assert_matches_rebuild(content)
+        self.assertNotIn("skill3", self.index.postings)
+        self.assertEqual(self.index.docs[:3], ["e0", "e1", "e2"])  # other doc numbers kept
+        self.assertEqual(self.index.docs[3], None)
+
+    def test_add_and_remove(self):
+        del self.entries[5]
+        self.entries.append(make_entry("new", title="Brand New"))
+        content = document(self.entries)
+
+        self.assertEqual(self.index.sync(content), 2)
+        self.assert_matches_rebuild(content)
+        self.assertNotIn("e5", self.index.docs)
+
+    def test_many_holes_renumber_from_scratch(self):
+        content = document(self.entries[:6])
+
+        self.assertEqual(self.index.sync(content), 6)
+        self.assertEqual(self.index.docs, [f"e{i}" for i in range(6)])
+        self.assert_matches_rebuild(content)
+
+    def test_sync_after_json_round_trip(self):
+        index = SearchIndex.from_json(self.index.to_json())
+        self.entries[0] = make_entry("e0", title="Changed")
+        content = document(self.entries)
+
+        self.assertEqual(index.sync(content), 1)
+        self.assertEqual(by_id(index), by_id(SearchIndex.from_content(content)))
+
+    def test_stale_format_is_rebuilt(self):
+        data = self.index.to_json()
+        data["version"] = SearchIndex.VERSION - 1
+        index = SearchIndex.from_json(data)
+
+        self.assertEqual(index.sync(document(self.entries)), 10)
+        self.assertEqual(by_id(index), by_id(self.index))
+
+
+
+def read_tree(root):
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, "rb") as f:
+                files[os.path.relpath(path, root)] = f.read()
+    return files
+
+
+class ExportShardsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.out_dir = os.path.join(self.tmp.name, "shards")
+        self.entries = [make_entry(f"e{i}", title=f"Entry {i}") for i in range(4)]
+        self.entries.append(make_entry("e-job", entry_type="experience"))
+        self.assertEqual(export_shards(self.content(), self.out_dir), (9, 0, 0))
+
+    def content(self):
+        content = cs.empty_content()
+        for entry in self.entries:
+            content[cs.CATEGORY_KEYS[entry["type"]]].append(entry)
+        return content
+
+    def assert_matches_full_export(self):
+        full = os.path.join(self.tmp.name, "full")
+        export_shards(self.content(), full)
+        self.assertEqual(read_tree(self.out_dir), read_tree(full))
+
+    def test_nothing_changed(self):
+        self.assertEqual(export_shards(self.content(), self.out_dir, changed=set()), (0, 9, 0))
+
+    def test_edit_rewrites_entry_and_its_category(self):
+        self.entries[1] = make_entry("e1", title="Edited")
+
+        self.assertEqual(export_shards(self.content(), self.out_dir, changed={"e1"}), (2, 7, 0))
+        self.assert_matches_full_export()
+
+    def test_add_and_remove(self):
+        del self.entries[2]
+        self.entries.append(make_entry("added"))
+
+        self.assertEqual(export_shards(self.content(), self.out_dir, changed={"e2", "added"}), (2, 7, 1))
+        self.assertFalse(os.path.exists(os.path.join(self.out_dir, "entries", "e2.json")))
+        self.assert_matches_full_export()
+
+    def test_missing_chunk_is_rewritten(self):
+        os.unlink(os.path.join(self.out_dir, "entries", "e0.json"))
+
+        self.assertEqual(export_shards(self.content(), self.out_dir, changed=set()), (1, 8, 0))
+        self.assert_matches_full_export()
+
+    def test_ids_that_fold_together_get_distinct_chunks(self):
+        self.entries = [make_entry(entry_id) for entry_id in ("a.b", "a_b", "Foo", "foo")]
+        export_shards(self.content(), self.out_dir)
+
+        with open(os.path.join(self.out_dir, "manifest.json"), encoding="utf-8") as f:
+            chunks = [entry["chunk"] for entry in json.load(f)["entries"]]
+        self.assertEqual(chunks[1], "entries/a_b.json")
+        self.assertEqual(chunks[3], "entries/foo.json")
+        self.assertEqual(len({chunk.lower() for chunk in chunks}), 4)
+        self.assertTrue(chunks[0].startswith("entries/a_b~"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import content_store as cs
+from helpers import make_entry
+
+
+class JournalReplayTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.file_path = os.path.join(self.tmp.name, "content.json")
+        document = cs.empty_content()
+        document["projects"] = [make_entry("t", title="t")]
+        cs.atomic_write(self.file_path, cs.serialize_content(document))
+
+    def open_store(self):
+        store = cs.ContentStore(self.file_path, journal=True, compact_every=100, snapshot=False)
+        store.load()
+        return store
+
+    def test_replay_after_compaction_skips_folded_in_records(self):
+        store = self.open_store()
+        store.commit(make_entry("j9", title="j9"))
+        store.commit_update("j9", make_entry("j9", title="edited"))
+
+        # Crash after compaction renamed content.json but before the journal was removed
+        journal = os.path.join(self.tmp.name, "journal.bak")
+        shutil.copy(store.journal_path, journal)
+        store.compact()
+        shutil.copy(journal, store.journal_path)
+
+        reloaded = self.open_store()
+        self.assertEqual([entry["title"] for entry in reloaded.content_data["projects"]], ["t", "edited"])
+        self.assertEqual(cs.validate_content(reloaded.content_data), [])
+
+    def test_replay_on_same_base_applies_every_record(self):
+        store = self.open_store()
+        store.commit(make_entry("j9", title="j9"))
+        store.commit_update("j9", make_entry("j9", title="edited"))
+        store.commit_delete("t")
+
+        reloaded = self.open_store()
+        self.assertEqual([entry["title"] for entry in reloaded.content_data["projects"]], ["edited"])
+        self.assertEqual(reloaded.pending, 3)
+
+
+
+class SnapshotRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.file_path = os.path.join(self.tmp.name, "content.json")
+        document = cs.empty_content()
+        document["projects"] = [make_entry("a", skills=["Python", "JS"]), make_entry("b", skills=["python"])]
+        cs.atomic_write(self.file_path, cs.serialize_content(document))
+        self.write_aliases({"JS": "JavaScript"})
+
+    def write_aliases(self, aliases):
+        with open(os.path.join(self.tmp.name, cs.SKILL_ALIASES_FILE), "w", encoding="utf-8") as f:
+            json.dump(aliases, f)
+
+    def open_store(self):
+        store = cs.ContentStore(self.file_path, journal=True, compact_every=100)
+        store.load()
+        store.wait_for_snapshot()
+        return store
+
+    def test_snapshot_load_restores_registry_without_building(self):
+        expected = self.open_store().skills.names()
+        with mock.patch.object(cs.SkillRegistry, "build", side_effect=AssertionError("rebuilt")):
+            store = self.open_store()
+            self.assertEqual(store.skills.names(), expected)
+            self.assertEqual(store.skills.count("PYTHON"), 2)
+            self.assertEqual(store.skills.resolve("js"), "JavaScript")
+
+    def test_restored_registry_includes_journal_records(self):
+        self.open_store().commit(make_entry("c", skills=["Rust"]))
+        with mock.patch.object(cs.SkillRegistry, "build", side_effect=AssertionError("rebuilt")):
+            store = self.open_store()
+            self.assertEqual(store.skills.count("rust"), 1)
+
+    def test_changed_aliases_rebuild_the_registry(self):
+        self.open_store()
+        self.write_aliases({"JS": "ECMAScript"})
+        self.assertEqual(self.open_store().skills.resolve("JS"), "ECMAScript")
+
+    def test_saved_snapshot_matches_the_saved_document(self):
+        store = self.open_store()
+        writer = cs.SaveWorker(store)
+        store.commit(make_entry("c", skills=["Rust"]))
+        store.request_save()
+        self.assertTrue(writer.close(timeout=10))
+        store.wait_for_snapshot()
+
+        with mock.patch.object(cs.SkillRegistry, "build", side_effect=AssertionError("rebuilt")):
+            self.assertEqual(self.open_store().skills.names(), ["Python", "JavaScript", "Rust"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import content_store as cs
+import populateContent
+from helpers import make_entry
+
+
+def record(title, **fields):
+    """A raw ingest record that passes validation"""
+    fields = {"title": title, "company": "Acme", "startDate": "2024-02", "detail": "d",
+              "type": "project", "skills": ["Python"], **fields}
+    return json.dumps(fields)
+
+
+class IngestTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.file_path = os.path.join(self.tmp.name, "content.json")
+        document = cs.empty_content()
+        document["projects"] = [make_entry("existing", skills=["Python", "JavaScript"])]
+        cs.atomic_write(self.file_path, cs.serialize_content(document))
+        self.store = cs.ContentStore(self.file_path, snapshot=False)
+        self.store.load()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        return path
+
+    def ingest(self, path, **kwargs):
+        out = io.StringIO()
+        result = cs.ingest(self.store, path, out=out, **kwargs)
+        return result, out.getvalue()
+
+    def saved_ids(self):
+        with open(self.file_path, encoding="utf-8") as f:
+            return [entry["id"] for entry in cs.iter_entries(json.load(f))]
+
+    def test_iter_records_jsonl(self):
+        path = self.write("records.jsonl", '{"title": "A"}\n\n{"title": \n[1, 2]\n{"title": "B"}\n')
+        self.assertEqual(list(cs.iter_records(path)), [
+            (1, {"title": "A"}, ""),
+            (3, None, "Invalid JSON: Expecting value"),
+            (4, None, "Record must be a JSON object"),
+            (5, {"title": "B"}, ""),
+        ])
+
+    def test_iter_records_csv(self):
+        path = self.write("records.csv", 'title,skills,detail\r\nA,Python;Go,one\r\nB,Rust,"two\r\nlines"\r\n')
+        self.assertEqual(list(cs.iter_records(path)), [
+            (2, {"title": "A", "skills": "Python;Go", "detail": "one"}, ""),
+            (4, {"title": "B", "skills": "Rust", "detail": "two\r\nlines"}, ""),
+        ])
+
+    def test_csv_rows_become_entries(self):
+        path = self.write("records.csv", "title,company,startDate,detail,type,skills,link_url,link_label\r\n"
+                                         "From CSV,Acme,2024-03,d,project,Go; Rust,https://example.com,Site\r\n")
+        self.assertEqual(self.ingest(path), ((1, 0), ""))
+        entry = self.store.get("from-csv")
+        self.assertEqual(entry["skills"], ["Go", "Rust"])
+        self.assertEqual(entry["link"], {"url": "https://example.com", "label": "Site"})
+        self.assertEqual(entry["category"], "Projects")
+
+    def test_bad_records_are_reported_by_line_and_skipped(self):
+        path = self.write("records.jsonl", "\n".join([
+            record("Good"),
+            "not json",
+            record("No Date", startDate=""),
+            record("Also Good"),
+        ]) + "\n")
+
+        (added, failed), report = self.ingest(path)
+        self.assertEqual((added, failed), (2, 2))
+        self.assertEqual(report.splitlines(), [
+            f"{path}:2: Invalid JSON: Expecting value",
+            f"{path}:3: Start Date is required",
+        ])
+        self.assertEqual(self.saved_ids(), ["existing", "good", "also-good"])
+
+    def test_duplicate_ids_within_one_batch(self):
+        path = self.write("records.jsonl", "\n".join([record("Twin"), record("Twin", detail="again")]) + "\n")
+
+        (added, failed), report = self.ingest(path)
+        self.assertEqual((added, failed), (1, 1))
+        self.assertEqual(report, f"{path}:2: ID 'twin' is already used by another entry\n")
+        self.assertEqual(self.store.get("twin")["detail"], "d")
+
+    def test_dry_run_validates_without_saving(self):
+        path = self.write("records.jsonl", record("New") + "\n")
+        before = os.stat(self.file_path).st_mtime_ns
+
+        self.assertEqual(self.ingest(path, dry_run=True), ((1, 0), ""))
+        self.assertEqual(os.stat(self.file_path).st_mtime_ns, before)
+        self.assertEqual(self.saved_ids(), ["existing"])
+
+    def test_cli_dry_run_reports_and_leaves_file_alone(self):
+        path = self.write("records.jsonl", record("New") + "\nnot json\n")
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            status = populateContent.main(["--file", self.file_path, "--no-snapshot", "ingest", path, "--dry-run"])
+
+        self.assertEqual(status, 1)  # a record was rejected
+        self.assertIn("Validated 1 entries (1 rejected)", stdout.getvalue())
+        self.assertIn(f"{path}:2: Invalid JSON", stderr.getvalue())
+        self.assertEqual(self.saved_ids(), ["existing"])
+
+    def test_skills_use_the_known_spelling(self):
+        record = {"title": "New", "company": "Acme", "startDate": "2024-02", "detail": "d",
+                  "type": "project", "skills": ["python", "PYTHON ", "javascript", "Go"]}
+        path = self.write("records.jsonl", json.dumps(record) + "\n")
+
+        self.assertEqual(self.ingest(path), ((1, 0), ""))
+        self.assertEqual(self.store.get("new")["skills"], ["Python", "JavaScript", "Go"])
+        self.assertEqual(self.store.skills.names(), ["Python", "JavaScript", "Go"])
+
+
+if __name__ == "__main__":
+    unittest.main()
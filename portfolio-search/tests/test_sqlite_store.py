@@ -0,0 +1,114 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import content_store as cs
+import populateContent
+from content_media import Image
+from content_sqlite import SQLiteStore
+from helpers import make_entry
+
+
+class SQLiteStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.file_path = os.path.join(self.tmp.name, "content.json")
+        self.db_path = os.path.join(self.tmp.name, "content.db")
+        document = cs.empty_content()
+        document["projects"] = [make_entry("team-project"), make_entry("snippet"), make_entry("cereal-site")]
+        SQLiteStore(self.file_path, self.db_path).import_document(document)
+
+    def open_store(self):
+        store = SQLiteStore(self.file_path, self.db_path)
+        store.load()
+        return store
+
+    def exported(self):
+        with open(self.file_path, encoding="utf-8") as f:
+            return {entry["id"]: entry for entry in cs.iter_entries(json.load(f))}
+
+    def test_save_keeps_other_editors_changes(self):
+        a = self.open_store()
+        b = self.open_store()
+        b.commit_update("team-project", make_entry("team-project", title="Edited by B"))
+        b.commit_delete("snippet")
+
+        a.commit(make_entry("new-entry", title="Added by A"))
+        a.save()
+
+        entries = self.exported()
+        self.assertEqual(entries["team-project"]["title"], "Edited by B")
+        self.assertNotIn("snippet", entries)
+        self.assertEqual(entries["new-entry"]["title"], "Added by A")
+        self.assertEqual(set(self.open_store().id_index), {"team-project", "cereal-site", "new-entry"})
+
+    def test_save_keeps_other_editors_changes_with_writer(self):
+        a = self.open_store()
+        b = self.open_store()
+        writer = cs.SaveWorker(a)
+        b.commit_update("team-project", make_entry("team-project", title="Edited by B"))
+
+        a.commit(make_entry("new-entry"))
+        a.request_save()
+        self.assertTrue(writer.close(timeout=10))
+        self.assertIsNone(writer.last_error)
+
+        entries = self.exported()
+        self.assertEqual(entries["team-project"]["title"], "Edited by B")
+        self.assertIn("new-entry", entries)
+
+    def test_save_writes_uncommitted_changes(self):
+        store = self.open_store()
+        store.add(make_entry("ingested"))
+        store.remove("snippet")
+        store.save()
+
+        self.assertEqual([entry["id"] for entry in self.open_store().content_data["projects"]],
+                         ["team-project", "cereal-site", "ingested"])
+        self.assertNotIn("snippet", self.exported())
+
+
+@unittest.skipIf(Image is None, "media needs Pillow")
+class SQLiteMediaTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.file_path = os.path.join(self.tmp.name, "content.json")
+        self.db_path = os.path.join(self.tmp.name, "content.db")
+        self.media_root = os.path.join(self.tmp.name, "pub")
+        os.makedirs(os.path.join(self.media_root, "gallery"))
+        Image.new("RGB", (640, 480), "teal").save(os.path.join(self.media_root, "gallery", "photo.png"))
+
+        document = cs.empty_content()
+        document["projects"] = [make_entry("gallery", photos=[{"caption": "Team", "filename": "photo.png"}])]
+        SQLiteStore(self.file_path, self.db_path).import_document(document)
+
+    def run_cli(self, *argv):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return populateContent.main(["--file", self.file_path, "--db", self.db_path, *argv,
+                                         "--media-root", self.media_root, "--jobs", "1"])
+
+    def assert_metadata_stored(self):
+        store = SQLiteStore(self.file_path, self.db_path)
+        store.load()
+        with open(self.file_path, encoding="utf-8") as f:
+            exported = json.load(f)["projects"][0]["photos"][0]
+        for photo in (store.get("gallery")["photos"][0], exported):
+            self.assertEqual((photo["width"], photo["height"]), (640, 480))
+            self.assertIn(480, [variant["width"] for variant in photo["variants"]])
+
+    def test_media_command_writes_metadata_to_the_database(self):
+        self.assertEqual(self.run_cli("media"), 0)
+        self.assert_metadata_stored()
+
+    def test_build_media_writes_metadata_to_the_database(self):
+        self.assertEqual(self.run_cli("build", "media"), 0)
+        self.assert_metadata_stored()
+
+
+if __name__ == "__main__":
+    unittest.main()
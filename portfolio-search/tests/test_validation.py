@@ -0,0 +1,67 @@
+import unittest
+from unittest import mock
+
+import content_store as cs
+from helpers import make_entry
+
+
+def document(*entries):
+    content = cs.empty_content()
+    for entry in entries:
+        content[cs.CATEGORY_KEYS[entry["type"]]].append(entry)
+    return content
+
+
+class ValidateContentTest(unittest.TestCase):
+    def test_valid_document_has_no_violations(self):
+        self.assertEqual(cs.validate_content(document(make_entry("a"), make_entry("b", entry_type="experience"))), [])
+
+    def test_null_start_date_is_allowed_only_when_stored(self):
+        entry = make_entry("a", startDate=None)
+        self.assertEqual(cs.validate_content(document(entry)), [])
+        self.assertEqual(cs.validate_entry(entry), (False, "Start Date is required"))
+        self.assertEqual(cs.validate_entry(entry, null_start=True), (True, ""))
+
+    def test_relevance_must_be_an_integer(self):
+        content = document(make_entry("text", relevance="3"), make_entry("flag", relevance=True),
+                           make_entry("fine", relevance=3))
+        self.assertEqual(cs.validate_content(content), [
+            ("projects[0] (text)", "Relevance must be a number"),
+            ("projects[1] (flag)", "Relevance must be a number"),
+        ])
+
+    def test_half_filled_link(self):
+        content = document(make_entry("a", link={"url": "https://example.com", "label": ""}),
+                           make_entry("b", link={"url": "https://example.com", "label": "Site"}))
+        self.assertEqual(cs.validate_content(content),
+                         [("projects[0] (a)", "Link must have both a URL and a label")])
+
+    def test_entry_in_the_wrong_category(self):
+        content = cs.empty_content()
+        content["experiences"].append(make_entry("a"))
+        self.assertEqual(cs.validate_content(content),
+                         [("experiences[0] (a)", "Type 'project' belongs in 'projects', not 'experiences'")])
+
+    def test_unknown_category_and_non_list_category(self):
+        content = cs.empty_content()
+        content["extras"] = []
+        content["experiences"] = {}
+        self.assertEqual([where for where, _ in cs.validate_content(content)], ["experiences", "extras"])
+
+    def test_duplicate_ids_across_categories(self):
+        content = document(make_entry("same"), make_entry("same", entry_type="experience"))
+        self.assertEqual(cs.validate_content(content),
+                         [("projects[0] (same)", "Duplicate id, first used at experiences[0]")])
+
+    def test_pool_matches_single_process(self):
+        entries = [make_entry(f"e{i}", relevance="high" if i % 7 == 0 else 2) for i in range(60)]
+        entries.append(make_entry("e3"))
+        content = document(*entries)
+        expected = cs.validate_content(content, jobs=1, chunk_size=8)
+        self.assertEqual(len(expected), 10)
+        with mock.patch.object(cs, "PARALLEL_VALIDATION_MIN", 1):
+            self.assertEqual(cs.validate_content(content, jobs=2, chunk_size=8), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()